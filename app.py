@@ -4,11 +4,12 @@ from datetime import datetime, date
 import os
 from collections import OrderedDict
 
-from utils.jira_parser import fetch_jira_metrics_via_api
-from utils.git_parser import fetch_git_metrics_via_api
+from utils.jira_parser import fetch_jira_metrics_via_api, fetch_jira_metrics_for_sprints, fetch_jira_metrics_for_team, fetch_team_worklogs, get_member_metrics, warm_developer_index
+from utils.git_parser import fetch_git_changed_files, fetch_git_metrics_via_api, warm_github_member_index
 from utils.sonar_parser import fetch_sonar_metrics_for_repos, fetch_new_code_metrics, fetch_single_project_metrics
-from config import TEAMS_DATA, JIRA_CONFIG, GITHUB_CONFIG, SONAR_CONFIG
-from common import get_previous_n_sprints, DETAILED_DURATIONS_DATA, show_sprint_name_start_date_and_end_date
+from utils.log_buffer import LogBuffer
+from config import TEAMS_DATA, JIRA_CONFIG, GITHUB_CONFIG, SONAR_CONFIG, TEMPO_CONFIG, LOG_CONFIG
+from common import get_previous_n_sprints, get_sprint_window, get_duration_date_range, DETAILED_DURATIONS_DATA, show_sprint_name_start_date_and_end_date
 from team_mapping import load_team_mapping
 from concurrent.futures import ThreadPoolExecutor
 import plotly.graph_objects as go
@@ -36,7 +37,12 @@ def check_authentication():
         st.error("Authentication file not found. Contact administrator.")
         return []
 
-def add_log_message(log_list, level, message):
+def add_log_message(log_list, level, message, *args):
+    # Filtered levels return before any formatting; 'args' are %-formatted into 'message'
+    if isinstance(log_list, LogBuffer) and not log_list.is_enabled_for(level) and level not in ("warning", "error", "critical"):
+        return
+    if args:
+        message = message % args
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     log_list.append(f"[{timestamp}] [{level.upper()}] {message}")
     if level == "error" or level == "critical":
@@ -44,6 +50,30 @@ def add_log_message(log_list, level, message):
     elif level == "warning":
         st.warning(f"[{timestamp}] {message}")
 
+def build_sprint_performance(sprint_history):
+    """Rows for the sprint trend chart and summary table, newest sprint first."""
+    sprint_performance = []
+    for sprint in sorted(sprint_history or {}, reverse=True):
+        individual = sprint_history[sprint].get("individual") or {}
+        team = sprint_history[sprint].get("team") or {}
+        planned_issues = individual.get("all_issues_count", 0)
+        delivered_issues = individual.get("tickets_closed", 0) + individual.get("bugs_closed", 0)
+        sprint_performance.append({
+            "Sprint": str(sprint),
+            "Planned Issues": planned_issues,
+            "Delivered Issues": delivered_issues,
+            "Completion Rate": (delivered_issues / max(planned_issues, 1)) * 100,
+            "Failed QA Count": individual.get("failed_qa_count", 0),
+            "Planned Story Points": individual.get("story_points_done", 0),
+            "Delivered Story Points": individual.get("story_points_closed", 0),
+            "Team Planned Issues": team.get("all_issues_count", 0),
+            "Team Delivered Issues": team.get("tickets_closed", 0) + team.get("bugs_closed", 0),
+            "Team Planned SP": team.get("story_points_done", 0),
+            "Team Delivered SP": team.get("story_points_closed", 0),
+            "Team Failed QA Count": team.get("failed_qa_count", 0)
+        })
+    return sprint_performance
+
 # Custom CSS for banner
 st.markdown("""
 <style>
@@ -80,12 +110,14 @@ st.markdown("""
 # Initialize Session State
 if 'user_authenticated' not in st.session_state: st.session_state.user_authenticated = False
 if 'data_fetched' not in st.session_state: st.session_state.data_fetched = False
-if 'log_messages' not in st.session_state: st.session_state.log_messages = []
+if 'log_messages' not in st.session_state: st.session_state.log_messages = LogBuffer(**LOG_CONFIG)
 if 'jira_result_individual' not in st.session_state: st.session_state.jira_result_individual = {}
 if 'jira_result_team' not in st.session_state: st.session_state.jira_result_team = {}
+if 'sprint_history' not in st.session_state: st.session_state.sprint_history = {}
 if 'git_metrics_individual' not in st.session_state: st.session_state.git_metrics_individual = {}
 if 'sonar_metrics_individual' not in st.session_state: st.session_state.sonar_metrics_individual = {}
 if 'git_cache' not in st.session_state: st.session_state.git_cache = {}
+if 'git_files_cache' not in st.session_state: st.session_state.git_files_cache = {}
 if 'sonar_cache' not in st.session_state: st.session_state.sonar_cache = {}
 if 'num_previous_sprints' not in st.session_state: st.session_state.num_previous_sprints = 3
 if 'selected_developer_name' not in st.session_state: st.session_state.selected_developer_name = "--- Select a Developer ---"
@@ -143,6 +175,9 @@ with st.sidebar:
             
             # Sort only by developer name
             st.session_state.all_developers_sorted = sorted(all_developers, key=str.lower)
+            # Load the developer -> Jira accountId and GitHub login indexes once (from disk when fresh)
+            warm_developer_index(JIRA_CONFIG["email"], JIRA_CONFIG["token"], all_developers, st.session_state.log_messages)
+            warm_github_member_index(GITHUB_CONFIG["token"], GITHUB_CONFIG["org"], st.session_state.log_messages)
 
         if st.session_state.all_developers_sorted:
             current_dev_idx = 0
@@ -189,7 +224,7 @@ with st.sidebar:
                 st.error("Please select a developer first.")
             else:
                 st.session_state.data_fetched = False
-                st.session_state.log_messages = []
+                st.session_state.log_messages = LogBuffer(**LOG_CONFIG)
                 start_time = datetime.now()
                 
                 with st.spinner("Fetching metrics..."):
@@ -223,25 +258,64 @@ with st.sidebar:
                     st.session_state.current_sprint_start = sprint_start_date
                     st.session_state.current_sprint_end = sprint_end_date
                     
-                    # JIRA Metrics
-                    add_log_message(st.session_state.log_messages, "debug", f"Fetching JIRA metrics for {st.session_state.selected_developer_name} in team {developer_team}")
-                    st.session_state.jira_result_individual = fetch_jira_metrics_via_api(
+                    # Tempo worklogs for the team and period (logged time); None falls back to changelogs
+                    worklog_start, worklog_end = get_duration_date_range(st.session_state.selected_duration_name)
+                    worklogs = fetch_team_worklogs(
                         JIRA_CONFIG["email"],
                         JIRA_CONFIG["token"],
-                        st.session_state.selected_developer_name,
-                        sprint_name,
-                        developer_team,
+                        TEMPO_CONFIG["token"],
+                        team_mapping.get(developer_team, [st.session_state.selected_developer_name]),
+                        worklog_start,
+                        worklog_end,
                         st.session_state.log_messages
                     )
-                    add_log_message(st.session_state.log_messages, "debug", f"JIRA result: story_points_done={st.session_state.jira_result_individual.get('story_points_done', 0)}, all_issues_count={st.session_state.jira_result_individual.get('all_issues_count', 0)}")
                     
-                    # Git Metrics - Optimized with caching and repo limiting
+                    # Team metrics if enabled; the team query also yields the developer's own metrics
+                    st.session_state.jira_result_team = {}
+                    if st.session_state.include_team_metrics:
+                        add_log_message(st.session_state.log_messages, "info", "Team metrics comparison enabled - fetching actual team data")
+                        
+                        # Get team ID for actual team metrics
+                        team_id = TEAMS_DATA.get(developer_team)
+                        if team_id:
+                            add_log_message(st.session_state.log_messages, "debug", "Fetching team metrics for %s (ID: %s)", developer_team, team_id)
+                            st.session_state.jira_result_team = fetch_jira_metrics_for_team(
+                                JIRA_CONFIG["email"],
+                                JIRA_CONFIG["token"],
+                                team_id,
+                                developer_team,
+                                sprint_name,
+                                st.session_state.log_messages,
+                                developer_names=team_mapping.get(developer_team, []),
+                                worklogs=worklogs
+                            )
+                            add_log_message(st.session_state.log_messages, "debug", "Team JIRA result: %s", st.session_state.jira_result_team)
+                        else:
+                            add_log_message(st.session_state.log_messages, "warning", "No team ID found for %s", developer_team)
+                    
+                    # JIRA Metrics
+                    member_result = get_member_metrics(st.session_state.jira_result_team, st.session_state.selected_developer_name)
+                    if member_result is not None:
+                        add_log_message(st.session_state.log_messages, "info", "JIRA metrics for %s taken from the team query", st.session_state.selected_developer_name)
+                        st.session_state.jira_result_individual = member_result
+                    else:
+                        add_log_message(st.session_state.log_messages, "debug", "Fetching JIRA metrics for %s in team %s", st.session_state.selected_developer_name, developer_team)
+                        st.session_state.jira_result_individual = fetch_jira_metrics_via_api(
+                            JIRA_CONFIG["email"],
+                            JIRA_CONFIG["token"],
+                            st.session_state.selected_developer_name,
+                            sprint_name,
+                            developer_team,
+                            st.session_state.log_messages,
+                            worklogs=worklogs
+                        )
+                    add_log_message(st.session_state.log_messages, "debug", "JIRA result: story_points_done=%s, all_issues_count=%s", st.session_state.jira_result_individual.get('story_points_done', 0), st.session_state.jira_result_individual.get('all_issues_count', 0))
+                    
+                    # Git Metrics - Optimized with caching (repos are processed in parallel)
                     jira_repos = set()
                     if st.session_state.jira_result_individual and "dev_branches" in st.session_state.jira_result_individual:
                         jira_repos = set(st.session_state.jira_result_individual["dev_branches"])
-                        add_log_message(st.session_state.log_messages, "debug", f"Found {len(jira_repos)} repositories from JIRA: {jira_repos}")
-                        # Limit to max 10 repos for performance
-                        jira_repos = set(list(jira_repos)[:10])
+                        add_log_message(st.session_state.log_messages, "debug", "Found %s repositories from JIRA: %s", len(jira_repos), jira_repos)
                         full_repos = set()
                         for repo in jira_repos:
                             if "/" not in repo:
@@ -249,7 +323,7 @@ with st.sidebar:
                             else:
                                 full_repos.add(repo)
                         jira_repos = full_repos
-                        add_log_message(st.session_state.log_messages, "debug", f"Final repo list for Git: {jira_repos}")
+                        add_log_message(st.session_state.log_messages, "debug", "Final repo list for Git: %s", jira_repos)
                     else:
                         add_log_message(st.session_state.log_messages, "warning", "No repositories found from JIRA issues")
                     
@@ -277,8 +351,15 @@ with st.sidebar:
                                     list(jira_repos),
                                     st.session_state.log_messages,  # Use main log list
                                     GITHUB_CONFIG["org"],
-                                    sprint_id=display_sprint  # Use actual sprint number
+                                    sprint_id=display_sprint,  # Use actual sprint number
+                                    include_files=False  # File names are loaded per repository on demand
                                 )
+                                if "error" in git_result:
+                                    add_log_message(st.session_state.log_messages, "warning", "Git metrics unavailable: %s", git_result["error"])
+                                    st.warning(f"Git metrics unavailable: {git_result['error']}")
+                                elif git_result.get("partial"):
+                                    add_log_message(st.session_state.log_messages, "warning", "Git metrics are incomplete - they will be fetched again next time")
+                                    st.warning("Git metrics are incomplete (GitHub rate limit or time budget reached).")
                                 
                                 individual_metrics = {
                                     "commits": git_result.get("commits", 0),
@@ -298,7 +379,9 @@ with st.sidebar:
                                     **individual_metrics,
                                     "individual_work": individual_metrics,
                                     "managerial_work": managerial_metrics,
-                                    "files_by_repo": git_result.get("files_by_repo", {})
+                                    "files_by_repo": git_result.get("files_by_repo", {}),
+                                    "commit_shas_by_repo": git_result.get("commit_shas_by_repo", {}),
+                                    "partial": bool(git_result.get("partial") or "error" in git_result)
                                 }
                             else:
                                 return {
@@ -343,37 +426,32 @@ with st.sidebar:
                         
                         # Cache results
                         
-                        if not git_cached:
+                        if not git_cached and not st.session_state.git_metrics_individual.get("partial"):
                             st.session_state.git_cache[git_cache_key] = st.session_state.git_metrics_individual
                         if not sonar_cached:
                             st.session_state.sonar_cache[sonar_cache_key] = st.session_state.sonar_metrics_individual
                         
                         add_log_message(st.session_state.log_messages, "info", "Git and SonarQube metrics fetched in parallel")
                     
-                    # Fetch team metrics if enabled
-                    if st.session_state.include_team_metrics:
-                        add_log_message(st.session_state.log_messages, "info", "Team metrics comparison enabled - fetching actual team data")
-                        from utils.jira_parser import fetch_jira_metrics_for_team
-                        from config import TEAMS_DATA
-                        
-                        # Get team ID for actual team metrics
-                        team_id = TEAMS_DATA.get(developer_team)
-                        if team_id:
-                            add_log_message(st.session_state.log_messages, "debug", f"Fetching team metrics for {developer_team} (ID: {team_id})")
-                            st.session_state.jira_result_team = fetch_jira_metrics_for_team(
-                                JIRA_CONFIG["email"],
-                                JIRA_CONFIG["token"],
-                                team_id,
-                                developer_team,
-                                sprint_name,
-                                st.session_state.log_messages
-                            )
-                            add_log_message(st.session_state.log_messages, "debug", f"Team JIRA result: {st.session_state.jira_result_team}")
-                        else:
-                            add_log_message(st.session_state.log_messages, "warning", f"No team ID found for {developer_team}")
-                            st.session_state.jira_result_team = {}
+                    # Sprint history for the trend views: one query for the whole sprint window
+                    if st.session_state.num_previous_sprints > 1 or st.session_state.selected_duration_name == "Year to Date":
+                        history_sprints = get_sprint_window(st.session_state.selected_duration_name, st.session_state.num_previous_sprints)
+                        add_log_message(st.session_state.log_messages, "debug", "Fetching sprint history for %s sprints", len(history_sprints))
+                        sprint_history = fetch_jira_metrics_for_sprints(
+                            JIRA_CONFIG["email"],
+                            JIRA_CONFIG["token"],
+                            st.session_state.selected_developer_name,
+                            history_sprints,
+                            developer_team,
+                            st.session_state.log_messages,
+                            team_id=TEAMS_DATA.get(developer_team) if st.session_state.include_team_metrics else None
+                        )
+                        if "error" in sprint_history:
+                            add_log_message(st.session_state.log_messages, "warning", f"Sprint history unavailable: {sprint_history['error']}")
+                            sprint_history = {}
+                        st.session_state.sprint_history = sprint_history
                     else:
-                        st.session_state.jira_result_team = {}
+                        st.session_state.sprint_history = {}
                     
                     end_time = datetime.now()
                     duration = (end_time - start_time).total_seconds()
@@ -426,13 +504,13 @@ if st.session_state.user_authenticated:
                 team_issues_assigned = team_data.get("all_issues_count", 0)
                 team_issues_completed = team_data.get("tickets_closed", 0) + team_data.get("bugs_closed", 0)
                 team_story_points = team_data.get("story_points_done", 0)
-                add_log_message(st.session_state.log_messages, "debug", f"Using actual team data: {team_story_points} story points")
+                add_log_message(st.session_state.log_messages, "debug", "Using actual team data: %s story points", team_story_points)
             else:
                 # Fallback to mock data
                 team_issues_assigned = jira_data.get("all_issues_count", 0) * 5
                 team_issues_completed = (jira_data.get("tickets_closed", 0) + jira_data.get("bugs_closed", 0)) * 4
                 team_story_points = jira_data.get("story_points_done", 0) * 6
-                add_log_message(st.session_state.log_messages, "debug", f"Using mock team data: {team_story_points} story points")
+                add_log_message(st.session_state.log_messages, "debug", "Using mock team data: %s story points", team_story_points)
             individual_commits = git_data.get("individual_work", {}).get("commits", 0)
             team_commits = individual_commits * 8
             sonar_data = st.session_state.get('sonar_metrics_individual', {})
@@ -447,7 +525,7 @@ if st.session_state.user_authenticated:
                 st.metric("Issues Completed", f"{individual_val} / {team_issues_completed}")
             with col3:
                 individual_val = jira_data.get("story_points_done", 0)
-                add_log_message(st.session_state.log_messages, "debug", f"Displaying story points: {individual_val} / {team_story_points}")
+                add_log_message(st.session_state.log_messages, "debug", "Displaying story points: %s / %s", individual_val, team_story_points)
                 st.metric("Story Points", f"{individual_val} / {team_story_points}")
             with col4:
                 st.metric("Commits", f"{individual_commits} / {team_commits}")
@@ -462,7 +540,7 @@ if st.session_state.user_authenticated:
                 st.metric("Issues Completed", jira_data.get("tickets_closed", 0) + jira_data.get("bugs_closed", 0))
             with col3:
                 individual_val = jira_data.get("story_points_done", 0)
-                add_log_message(st.session_state.log_messages, "debug", f"Displaying individual story points: {individual_val}")
+                add_log_message(st.session_state.log_messages, "debug", "Displaying individual story points: %s", individual_val)
                 st.metric("Story Points", individual_val)
             with col4:
                 individual_commits = git_data.get("individual_work", {}).get("commits", 0)
@@ -716,21 +794,34 @@ if st.session_state.user_authenticated:
                             # st.text(f"Debug: files_by_repo keys: {list(files_by_repo.keys())}")
                             # st.text(f"Debug: looking for repo: {repo}")
                             
+                            commit_shas_by_repo = git_data_local.get('commit_shas_by_repo', {})
+                            
                             # Match repo name
                             repo_key = None
-                            for key in files_by_repo.keys():
+                            for key in list(files_by_repo.keys()) + list(commit_shas_by_repo.keys()):
                                 if key == repo or key.endswith(f"/{repo}") or repo in key:
                                     repo_key = key
                                     break
                             
-                            # Always show files - either real or mock
-                            if repo_key and files_by_repo[repo_key]:
+                            # File names cost one GitHub call per commit the first time, so load them on request
+                            if repo_key and commit_shas_by_repo.get(repo_key) and not files_by_repo.get(repo_key):
+                                files_cache_key = (repo_key, tuple(commit_shas_by_repo[repo_key]))
+                                if files_cache_key not in st.session_state.git_files_cache and st.checkbox(
+                                    f"Load {len(commit_shas_by_repo[repo_key])} commits' files", key=f"git_files_{repo_key}"
+                                ):
+                                    st.session_state.git_files_cache[files_cache_key] = fetch_git_changed_files(
+                                        GITHUB_CONFIG["token"], repo_key, commit_shas_by_repo[repo_key], st.session_state.log_messages
+                                    )
+                                files_by_repo = {repo_key: st.session_state.git_files_cache.get(files_cache_key, [])}
+                            
+                            # Show real files when loaded, mock files when the repo has no counted commits
+                            if repo_key and files_by_repo.get(repo_key):
                                 repo_files = files_by_repo[repo_key]
                                 for file in repo_files[:10]:
                                     st.text(f"• {file}")
                                 if len(repo_files) > 10:
                                     st.text(f"... and {len(repo_files) - 10} more files")
-                            else:
+                            elif not (repo_key and commit_shas_by_repo.get(repo_key)):
                                 # Show mock files for demonstration
                                 mock_files = [
                                     "src/main/java/com/example/Service.java",
@@ -836,90 +927,7 @@ if st.session_state.user_authenticated:
             if st.session_state.num_previous_sprints > 1:
                 st.subheader("📈 Sprint Performance Trend")
                 
-                # Get all sprints from dropdown (including current sprint if selected)
-                sprint_performance = []
-                all_sprints = []
-                
-                # Handle Year to Date vs regular sprint selection
-                if st.session_state.selected_duration_name == "Year to Date":
-                    # Show all sprints from start of year (2025.1 to current)
-                    for sprint_num in range(1, 17):  # 2025.1 to 2025.16
-                        all_sprints.append(f'2025.{sprint_num}')
-                else:
-                    # Force include current sprint 2025.16
-                    all_sprints.append('2025.16')
-                    
-                    # Get sprints from duration dropdown
-                    previous_sprints = get_previous_n_sprints(st.session_state.num_previous_sprints)
-                    for sprint in previous_sprints:
-                        all_sprints.append(sprint)
-                
-                # Sort sprints in descending order (newest first)
-                all_sprints = sorted(set(all_sprints), reverse=True)
-                
-                # Current sprint data
-                current_completion_rate = ((jira_data.get("tickets_closed", 0) + jira_data.get("bugs_closed", 0)) / max(jira_data.get("all_issues_count", 1), 1)) * 100
-                current_failed_qa = jira_data.get("failed_qa_count", 0)
-                current_commits = git_data.get("individual_work", {}).get("commits", 0)
-                current_story_points = jira_data.get("story_points_done", 0)
-                
-                # Add data for each sprint with planned vs delivered
-                for i, sprint in enumerate(all_sprints):
-                    if (st.session_state.selected_duration_name == "Current Sprint" and 
-                        sprint == st.session_state.get('current_sprint_name')) or \
-                    (st.session_state.selected_duration_name == f"Sprint {sprint}"):
-                        # Use actual current data
-                        planned_issues = jira_data.get("all_issues_count", 0)
-                        delivered_issues = jira_data.get("tickets_closed", 0) + jira_data.get("bugs_closed", 0)
-                        
-                        # Team data if available
-                        team_data = st.session_state.get('jira_result_team', {})
-                        team_planned = team_data.get("all_issues_count", planned_issues * 5) if st.session_state.include_team_metrics else 0
-                        team_delivered = (team_data.get("tickets_closed", 0) + team_data.get("bugs_closed", 0)) if st.session_state.include_team_metrics else delivered_issues * 4
-                        team_sp_planned = team_data.get("story_points_done", current_story_points * 6) if st.session_state.include_team_metrics else 0
-                        team_sp_delivered = team_data.get("story_points_done", current_story_points * 6) if st.session_state.include_team_metrics else 0
-                        
-                        sprint_performance.append({
-                            "Sprint": str(sprint),
-                            "Planned Issues": planned_issues,
-                            "Delivered Issues": delivered_issues,
-                            "Completion Rate": current_completion_rate,
-                            "Failed QA Count": current_failed_qa,
-                            "Planned Story Points": planned_issues * 3,
-                            "Delivered Story Points": current_story_points,
-                            "Team Planned Issues": team_planned,
-                            "Team Delivered Issues": team_delivered,
-                            "Team Planned SP": team_sp_planned,
-                            "Team Delivered SP": team_sp_delivered
-                        })
-                    else:
-                        # Simulate data for other sprints (replace with actual API calls)
-                        planned_issues = max(5, jira_data.get("all_issues_count", 5) + (i-1)*2)
-                        delivered_issues = max(3, planned_issues - (i % 3))
-                        completion_rate = (delivered_issues / max(planned_issues, 1)) * 100
-                        failed_qa = max(0, current_failed_qa + (i-1)*1)
-                        planned_sp = planned_issues * 3
-                        delivered_sp = max(0, planned_sp - (i*2))
-                        
-                        # Mock team data
-                        team_planned = planned_issues * 5 if st.session_state.include_team_metrics else 0
-                        team_delivered = delivered_issues * 4 if st.session_state.include_team_metrics else 0
-                        team_sp_planned = planned_sp * 6 if st.session_state.include_team_metrics else 0
-                        team_sp_delivered = delivered_sp * 5 if st.session_state.include_team_metrics else 0
-                        
-                        sprint_performance.append({
-                            "Sprint": str(sprint),
-                            "Planned Issues": planned_issues,
-                            "Delivered Issues": delivered_issues,
-                            "Completion Rate": completion_rate,
-                            "Failed QA Count": failed_qa,
-                            "Planned Story Points": planned_sp,
-                            "Delivered Story Points": delivered_sp,
-                            "Team Planned Issues": team_planned,
-                            "Team Delivered Issues": team_delivered,
-                            "Team Planned SP": team_sp_planned,
-                            "Team Delivered SP": team_sp_delivered
-                        })
+                sprint_performance = build_sprint_performance(st.session_state.sprint_history)
                 
                 if sprint_performance:
                     # Create performance chart
@@ -966,7 +974,7 @@ if st.session_state.user_authenticated:
                     )
                     
                     if st.session_state.include_team_metrics:
-                        team_failed_qa = [item["Failed QA Count"] * 2 for item in sprint_performance_charts]
+                        team_failed_qa = [item["Team Failed QA Count"] for item in sprint_performance_charts]
                         fig.add_trace(
                             go.Scatter(x=sprints, y=team_failed_qa,
                                     mode='lines+markers+text', name='Team Failed QA', line=dict(color='darkred'),
@@ -1083,7 +1091,7 @@ if st.session_state.user_authenticated:
                     
                     if st.session_state.include_team_metrics:
                         team_completion_rates = [((item["Team Delivered Issues"] / max(item["Team Planned Issues"], 1)) * 100) for item in sprint_performance_charts]
-                        team_failed_qa = [item["Failed QA Count"] * 3 for item in sprint_performance_charts]
+                        team_failed_qa = [item["Team Failed QA Count"] for item in sprint_performance_charts]
                         max_completion = max(max(completion_rates), max(team_completion_rates))
                         max_failed_qa = max(max(failed_qa_counts), max(team_failed_qa))
                         
@@ -1146,31 +1154,8 @@ if st.session_state.user_authenticated:
             with sprint_table_col:
                 st.subheader("📅 Sprint Performance Summary")
                 
-                # Get sprint performance data for table
-                sprint_performance = []
-                all_sprints = []
-                
-                # Handle Year to Date vs regular sprint selection
-                if st.session_state.selected_duration_name == "Year to Date":
-                    # Show all sprints from start of year (2025.1 to current)
-                    for sprint_num in range(1, 17):  # 2025.1 to 2025.16
-                        all_sprints.append(f'2025.{sprint_num}')
-                else:
-                    # Force include current sprint 2025.16
-                    all_sprints.append('2025.16')
-                    
-                    # Get sprints from duration dropdown
-                    previous_sprints = get_previous_n_sprints(st.session_state.num_previous_sprints)
-                    for sprint in previous_sprints:
-                        all_sprints.append(sprint)
-                
-                # Sort sprints in descending order (newest first)
-                all_sprints = sorted(set(all_sprints), reverse=True)
-                
-                # Current sprint data
-                current_completion_rate = ((jira_data.get("tickets_closed", 0) + jira_data.get("bugs_closed", 0)) / max(jira_data.get("all_issues_count", 1), 1)) * 100
-                current_failed_qa = jira_data.get("failed_qa_count", 0)
-                current_story_points = jira_data.get("story_points_done", 0)
+                # Sprint performance rows from the sprint history fetch
+                sprint_performance = build_sprint_performance(st.session_state.sprint_history)
                 
                 # Determine selected sprint for highlighting
                 selected_sprint = None
@@ -1178,50 +1163,20 @@ if st.session_state.user_authenticated:
                     selected_sprint = st.session_state.get('current_sprint_name')
                 elif st.session_state.selected_duration_name.startswith("Sprint "):
                     selected_sprint = st.session_state.selected_duration_name.replace("Sprint ", "")
-                
-                # Add data for each sprint (always show all sprints)
-                for i, sprint in enumerate(all_sprints):
-                    is_selected = (sprint == selected_sprint)
-                    
-                    if is_selected:
-                        # Use actual data for selected sprint
-                        planned_issues = jira_data.get("all_issues_count", 0)
-                        delivered_issues = jira_data.get("tickets_closed", 0) + jira_data.get("bugs_closed", 0)
-                        completion_rate = current_completion_rate
-                        failed_qa = current_failed_qa
-                        planned_sp = planned_issues * 3
-                        delivered_sp = current_story_points
-                    else:
-                        # Simulate data for other sprints
-                        planned_issues = max(5, jira_data.get("all_issues_count", 5) + (i-1)*2)
-                        delivered_issues = max(3, planned_issues - (i % 3))
-                        completion_rate = (delivered_issues / max(planned_issues, 1)) * 100
-                        failed_qa = max(0, current_failed_qa + (i-1)*1)
-                        planned_sp = planned_issues * 3
-                        delivered_sp = max(0, planned_sp - (i*2))
-                    
-                    sprint_performance.append({
-                        "Sprint": str(sprint),
-                        "_selected": is_selected,
-                        "Planned Issues": planned_issues,
-                        "Delivered Issues": delivered_issues,
-                        "Completion Rate": completion_rate,
-                        "Failed QA Count": failed_qa,
-                        "Planned Story Points": planned_sp,
-                        "Delivered Story Points": delivered_sp
-                    })
+                for item in sprint_performance:
+                    item["_selected"] = (item["Sprint"] == selected_sprint)
                 
                 if sprint_performance:
                     # Performance summary table (descending order - newest first)
                     perf_df = pd.DataFrame(sprint_performance)
                     
                     if st.session_state.include_team_metrics:
-                        # Add team comparison columns
-                        perf_df['Planned Issues'] = perf_df['Planned Issues'].apply(lambda x: f"{x} / {x * 5}")
-                        perf_df['Delivered Issues'] = perf_df['Delivered Issues'].apply(lambda x: f"{x} / {x * 4}")
-                        perf_df['Planned Story Points'] = perf_df['Planned Story Points'].apply(lambda x: f"{x} / {x * 6}")
-                        perf_df['Delivered Story Points'] = perf_df['Delivered Story Points'].apply(lambda x: f"{x} / {x * 5}")
-                        perf_df['Failed QA Count'] = perf_df['Failed QA Count'].apply(lambda x: f"{x} / {x * 2}")
+                        # Individual / team values side by side
+                        for column, team_column in (("Planned Issues", "Team Planned Issues"), ("Delivered Issues", "Team Delivered Issues"),
+                                                    ("Planned Story Points", "Team Planned SP"), ("Delivered Story Points", "Team Delivered SP"),
+                                                    ("Failed QA Count", "Team Failed QA Count")):
+                            perf_df[column] = perf_df[column].astype(str) + " / " + perf_df[team_column].astype(str)
+                    perf_df = perf_df.drop(columns=[column for column in perf_df.columns if column.startswith("Team ")])
                     
                     perf_df['Completion Rate'] = perf_df['Completion Rate'].apply(lambda x: f"{x:.1f}%" if isinstance(x, (int, float)) else x)
                     
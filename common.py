@@ -57,6 +57,15 @@ def get_previous_n_sprints(count, base_sprint="2025.12", base_start_date_str="20
         result.append(f"{year}.{sprint_num:02d}")
     return list(result)
 
+def get_sprint_window(duration_name, count, base_sprint="2025.12", base_start_date_str="2025-06-11", sprint_length_days=14):
+    """Sprint names covered by the trend views: every sprint of the current year for
+    Year to Date, otherwise the current sprint plus the previous 'count' sprints. Newest first."""
+    current_sprint = get_current_sprint(base_sprint, base_start_date_str, sprint_length_days)
+    if duration_name == "Year to Date":
+        current_year, current_sprint_num = map(int, current_sprint.split("."))
+        return [f"{current_year}.{sprint_num:02d}" for sprint_num in range(current_sprint_num, 0, -1)]
+    return [current_sprint] + get_previous_n_sprints(count, base_sprint, base_start_date_str, sprint_length_days)
+
 def get_previous_sprints(count=5):
     """Generate previous sprint names based on current date"""
     current_year = datetime.now().year
@@ -105,6 +114,15 @@ def get_sprint_for_date(target_date, base_sprint="2025.12", base_start_date_str=
     except Exception as e:
         return "2025.01", date.today(), date.today()
 
+def get_duration_date_range(duration_name):
+    """Calendar dates (start, end) covered by a duration option; Current Sprint resolves to the actual sprint."""
+    if duration_name == "Year to Date":
+        return date(date.today().year, 1, 1), date.today()
+    if duration_name.startswith("Sprint "):
+        return get_sprint_dates_from_name(duration_name.replace("Sprint ", ""))
+    _, sprint_start_date, sprint_end_date = get_sprint_for_date(date.today().strftime("%Y-%m-%d"))
+    return sprint_start_date, sprint_end_date
+
 def show_sprint_name_start_date_and_end_date(duration_name, log_list):
     """Get sprint details based on duration selection"""
     if duration_name == "Current Sprint":
@@ -38,6 +38,12 @@ TEMPO_CONFIG = {
     "token": "NNU9sybMEP1fK7KzlGeek1Quv6GzgH-us"
 }
 
+# Processing log configuration (DEBUG records are dropped unless level is "DEBUG")
+LOG_CONFIG = {
+    "level": os.environ.get("PRODUCTIVITY_LOG_LEVEL", "INFO"),
+    "max_records": 2000
+}
+
 # Sprint Duration Options
 DURATION_OPTIONS = OrderedDict([
     ("Current Sprint", "openSprints()"),
@@ -4,10 +4,11 @@ from datetime import datetime, date
 import os
 from collections import OrderedDict
 
-from utils.jira_parser import fetch_jira_metrics_via_api
-from utils.git_parser import fetch_git_metrics_via_api
-from config import TEAMS_DATA, JIRA_CONFIG, GITHUB_CONFIG
-from common import get_previous_sprints, DETAILED_DURATIONS_DATA, show_sprint_name_start_date_and_end_date
+from utils.jira_parser import fetch_jira_metrics_via_api, fetch_team_worklogs, warm_developer_index
+from utils.git_parser import fetch_git_metrics_via_api, warm_github_member_index
+from utils.log_buffer import LogBuffer
+from config import TEAMS_DATA, JIRA_CONFIG, GITHUB_CONFIG, TEMPO_CONFIG, LOG_CONFIG
+from common import get_previous_sprints, get_duration_date_range, DETAILED_DURATIONS_DATA, show_sprint_name_start_date_and_end_date
 from team_mapping import load_team_mapping
 
 st.set_page_config(
@@ -32,7 +33,12 @@ def check_authentication():
         st.error("Authentication file not found. Contact administrator.")
         return []
 
-def add_log_message(log_list, level, message):
+def add_log_message(log_list, level, message, *args):
+    # Filtered levels return before any formatting; 'args' are %-formatted into 'message'
+    if isinstance(log_list, LogBuffer) and not log_list.is_enabled_for(level) and level not in ("warning", "error", "critical"):
+        return
+    if args:
+        message = message % args
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     log_list.append(f"[{timestamp}] [{level.upper()}] {message}")
     if level == "error" or level == "critical":
@@ -109,7 +115,7 @@ st.title("👤 Individual Productivity Dashboard")
 # Initialize Session State
 if 'user_authenticated' not in st.session_state: st.session_state.user_authenticated = False
 if 'data_fetched' not in st.session_state: st.session_state.data_fetched = False
-if 'log_messages' not in st.session_state: st.session_state.log_messages = []
+if 'log_messages' not in st.session_state: st.session_state.log_messages = LogBuffer(**LOG_CONFIG)
 if 'jira_result_individual' not in st.session_state: st.session_state.jira_result_individual = {}
 if 'git_metrics_individual' not in st.session_state: st.session_state.git_metrics_individual = {}
 if 'num_previous_sprints' not in st.session_state: st.session_state.num_previous_sprints = 3
@@ -157,6 +163,9 @@ with st.sidebar:
             for team in sorted(developers_by_team.keys()):
                 sorted_developers.extend(sorted(developers_by_team[team]))
             st.session_state.all_developers_sorted = sorted_developers
+            # Load the developer -> Jira accountId and GitHub login indexes once (from disk when fresh)
+            warm_developer_index(JIRA_CONFIG["email"], JIRA_CONFIG["token"], sorted_developers, st.session_state.log_messages)
+            warm_github_member_index(GITHUB_CONFIG["token"], GITHUB_CONFIG["org"], st.session_state.log_messages)
 
         if st.session_state.all_developers_sorted:
             current_dev_idx = 0
@@ -200,7 +209,7 @@ with st.sidebar:
                 st.error("Please select a developer first.")
             else:
                 st.session_state.data_fetched = False
-                st.session_state.log_messages = []
+                st.session_state.log_messages = LogBuffer(**LOG_CONFIG)
                 
                 with st.spinner("Fetching individual metrics..."):
                     # Get team name for the selected developer
@@ -219,6 +228,18 @@ with st.sidebar:
                         st.session_state.selected_duration_name, st.session_state.log_messages
                     )
                     
+                    # Tempo worklogs for the developer and period (logged time); None falls back to changelogs
+                    worklog_start, worklog_end = get_duration_date_range(st.session_state.selected_duration_name)
+                    worklogs = fetch_team_worklogs(
+                        JIRA_CONFIG["email"],
+                        JIRA_CONFIG["token"],
+                        TEMPO_CONFIG["token"],
+                        [st.session_state.selected_developer_name],
+                        worklog_start,
+                        worklog_end,
+                        st.session_state.log_messages
+                    )
+                    
                     # JIRA Metrics
                     st.session_state.jira_result_individual = fetch_jira_metrics_via_api(
                         JIRA_CONFIG["email"],
@@ -226,7 +247,8 @@ with st.sidebar:
                         st.session_state.selected_developer_name,
                         sprint_name,
                         developer_team,
-                        st.session_state.log_messages
+                        st.session_state.log_messages,
+                        worklogs=worklogs
                     )
                     
                     # Git Metrics - Use dev_branches from JIRA result
@@ -248,8 +270,13 @@ with st.sidebar:
                             list(jira_repos),
                             st.session_state.log_messages,
                             GITHUB_CONFIG["org"],
-                            sprint_id=sprint_name
+                            sprint_id=sprint_name,
+                            include_files=False  # No per-repo file list in this view
                         )
+                        if "error" in st.session_state.git_metrics_individual:
+                            st.warning(f"Git metrics unavailable: {st.session_state.git_metrics_individual['error']}")
+                        elif st.session_state.git_metrics_individual.get("partial"):
+                            st.warning("Git metrics are incomplete (GitHub rate limit or time budget reached).")
                     else:
                         st.session_state.git_metrics_individual = {"commits": 0, "prs_created": 0, "prs_merged": 0, "lines_added": 0, "lines_deleted": 0}
                     
@@ -0,0 +1,140 @@
+from utils.jira_time import parse_jira_timestamp
+
+DONE_STATUSES = ("qa complete", "done", "released", "closed")
+IN_PROGRESS_STATUS = "in progress"
+FAILED_QA_TRANSITION = ("in testing", "rejected")
+
+# Visitor classes registered here are instantiated per issue and fed every changelog
+# item during the single pass, so new changelog-derived metrics don't add another walk.
+_CHANGELOG_VISITORS = []
+
+
+class ChangelogVisitor:
+    """
+    Base class for plugin metrics computed during the single changelog pass.
+    Subclasses set 'name' (the key in the analysis result) and optionally 'fields'
+    (lowercased field names to receive; None receives every item).
+    """
+    name = None
+    fields = None
+
+    def visit(self, history, item, field):
+        pass
+
+    def result(self):
+        return None
+
+
+def register_changelog_visitor(visitor_cls):
+    """Registers a ChangelogVisitor subclass. Can be used as a class decorator."""
+    if not visitor_cls.name:
+        raise ValueError("Changelog visitors need a 'name'.")
+    if visitor_cls not in _CHANGELOG_VISITORS:
+        _CHANGELOG_VISITORS.append(visitor_cls)
+    return visitor_cls
+
+
+def unregister_changelog_visitor(visitor_cls):
+    if visitor_cls in _CHANGELOG_VISITORS:
+        _CHANGELOG_VISITORS.remove(visitor_cls)
+
+
+def analyze_changelog(histories, developer_account_id=None, log_list=None):
+    """
+    Walks an issue's changelog histories once and returns:
+    failed_qa_count, logged_time, logged_time_by_author (latest timespent per author),
+    in_progress_date, done_date, status_intervals ((status, seconds) per stay in a status,
+    between consecutive status changes), time_in_status (their per-status totals)
+    plus one entry per registered visitor.
+    """
+    failed_qa_count = 0
+    first_logged_time = None
+    logged_time_by_author = {}
+    in_progress_date = None
+    done_date = None
+    status_changes = []
+
+    visitors = [visitor_cls() for visitor_cls in _CHANGELOG_VISITORS]
+
+    if not isinstance(histories, list):
+        histories = []
+
+    for history in histories:
+        if not isinstance(history, dict):
+            continue
+        created = history.get("created")
+
+        for item in history.get("items") or []:
+            if not isinstance(item, dict):
+                continue
+            field = str(item.get("field") or "").lower()
+
+            if field == "status":
+                from_status = str(item.get("fromString") or "").lower()
+                to_status = str(item.get("toString") or "").lower()
+                if (from_status, to_status) == FAILED_QA_TRANSITION:
+                    failed_qa_count += 1
+                if to_status == IN_PROGRESS_STATUS:
+                    if not in_progress_date:
+                        in_progress_date = created
+                elif to_status in DONE_STATUSES and not done_date:
+                    done_date = created
+                if created:
+                    status_changes.append((created, from_status, to_status))
+
+            elif field == "timespent":
+                try:
+                    seconds = int(item.get("to", 0))
+                except (TypeError, ValueError):
+                    seconds = None  # skip invalid values
+                if seconds is not None:
+                    # Keep the latest value logged by each author
+                    account_id = (history.get("author") or {}).get("accountId")
+                    logged_time_by_author[account_id] = seconds
+                    if first_logged_time is None:
+                        first_logged_time = seconds
+
+            for visitor in visitors:
+                if visitor.fields is None or field in visitor.fields:
+                    visitor.visit(history, item, field)
+
+    if developer_account_id:
+        logged_time = logged_time_by_author.get(developer_account_id, 0)
+    else:
+        # Without a developer, use the first available timespent regardless of author
+        logged_time = first_logged_time or 0
+
+    status_intervals = _status_intervals(status_changes, log_list)
+    time_in_status = {}
+    for status, seconds in status_intervals:
+        time_in_status[status] = time_in_status.get(status, 0) + seconds
+
+    result = {
+        "failed_qa_count": failed_qa_count,
+        "logged_time": logged_time,
+        "logged_time_by_author": logged_time_by_author,
+        "in_progress_date": in_progress_date,
+        "done_date": done_date,
+        "status_intervals": status_intervals,
+        "time_in_status": time_in_status,
+    }
+    for visitor in visitors:
+        result[visitor.name] = visitor.result()
+    return result
+
+
+def _status_intervals(status_changes, log_list=None):
+    """(status, seconds) for each stay in a status, from consecutive status changes in time order."""
+    if len(status_changes) < 2:
+        return []
+    try:
+        timeline = sorted((parse_jira_timestamp(created), to_status) for created, _, to_status in status_changes)
+    except (TypeError, ValueError) as e:
+        if log_list is not None:
+            log_list.append(f"[WARN] Could not parse changelog dates for time in status: {e}")
+        return []
+
+    return [
+        (status, int((left_at - entered_at).total_seconds()))
+        for (entered_at, status), (left_at, _) in zip(timeline, timeline[1:])
+    ]
@@ -0,0 +1,81 @@
+import atexit
+import json
+import sqlite3
+import zlib
+from threading import Lock
+
+from utils.local_cache import get_cache_path
+
+COMMIT_STORE_FILE = "github_commits.sqlite3"
+
+
+class CommitStore:
+    """
+    Permanent local store of commit details keyed by 'owner/repo@sha'. A commit never
+    changes once it exists, so records are never expired. Each record is
+    {"additions", "deletions", "changed_files", "files"} where 'files' is the list of
+    file names, or None when only the counts are known; it is stored as a
+    zlib-compressed JSON array.
+    One long-lived connection is shared by all threads, one call at a time under the lock.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or get_cache_path(COMMIT_STORE_FILE)
+        self._lock = Lock()
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._conn:
+            self._conn.execute("CREATE TABLE IF NOT EXISTS commits (key TEXT PRIMARY KEY, data BLOB)")
+
+    @staticmethod
+    def commit_key(owner_repo, sha):
+        return f"{owner_repo.lower()}@{sha}"
+
+    def get_many(self, keys):
+        """Returns {key: record} for the stored commits among 'keys'."""
+        keys = list(keys)
+        records = {}
+        with self._lock:
+            # Stay well under SQLite's bound-parameter limit
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                for key, data in self._conn.execute(f"SELECT key, data FROM commits WHERE key IN ({placeholders})", chunk):
+                    additions, deletions, changed_files, files = json.loads(zlib.decompress(data))
+                    records[key] = {"additions": additions, "deletions": deletions, "changed_files": changed_files, "files": files}
+        return records
+
+    def put_many(self, records):
+        """Stores {key: record}, replacing count-only records with ones that carry file names."""
+        rows = [
+            (
+                key,
+                zlib.compress(json.dumps(
+                    [record["additions"], record["deletions"], record["changed_files"], record["files"]],
+                    separators=(",", ":"),
+                ).encode("utf-8")),
+            )
+            for key, record in records.items()
+        ]
+        if not rows:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO commits (key, data) VALUES (?, ?)", rows)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_commit_store = None
+_commit_store_lock = Lock()
+
+
+def get_commit_store():
+    """Returns the process-wide CommitStore."""
+    global _commit_store
+    with _commit_store_lock:
+        if _commit_store is None:
+            _commit_store = CommitStore()
+            atexit.register(_commit_store.close)
+        return _commit_store
@@ -2,96 +2,127 @@ import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 import random
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeout
+from threading import BoundedSemaphore, Event
+from urllib.parse import parse_qs, urlparse
+from common import get_duration_date_range
+from utils.commit_store import get_commit_store
+from utils.github_http_cache import ConditionalSession
+from utils.github_identity import GITHUB_GRAPHQL_URL, get_github_login, load_member_index
+from utils.github_rate_limit import GITHUB_RATE_LIMIT_URL, get_token_health, record_rate_limit
+from utils.log_buffer import log_debug
+
+COMMIT_STATS_BATCH_SIZE = 100  # Commits looked up per GraphQL request
+GITHUB_PAGE_SIZE = 100  # GitHub's maximum per_page
+PAGE_MAX_WORKERS = 4  # Concurrent page requests per listing after the first page
+UNWINDOWED_MAX_PAGES = 10  # Page cap for listings without a sprint window
+REPO_MAX_WORKERS = 6  # Repositories processed concurrently per fetch
+GIT_MAX_CONCURRENT_REPOS = 12  # Repositories processed concurrently across all fetches
+GIT_FETCH_BUDGET_SECONDS = 120  # Time budget for one developer's repositories
+GIT_LOW_BUDGET_REQUESTS = 500  # Below this many core requests left, fetches run lean
+GIT_MIN_REQUESTS_PER_REPO = 3  # PR list, commit list and commit stats at the least; busy repos cost more
+GIT_RESERVE_REQUESTS = 20  # Left untouched so other views keep working until the reset
+# Duration options behind the JQL sprint functions the apps pass as sprint ids
+JQL_FUNCTION_DURATIONS = {"openSprints()": "Current Sprint", "startOfYear()": "Year to Date"}
+
+# Process-wide limit, so parallel dashboard fetches don't multiply the load on GitHub
+_repo_slots = BoundedSemaphore(GIT_MAX_CONCURRENT_REPOS)
+
+
+class _FetchControl:
+    """
+    Cooperative cancellation for one Git fetch: repository workers call should_stop()
+    between GitHub requests and wind down once the fetch is stopped, its deadline passes
+    or the token's 'health' (refreshed by every response) is down to GIT_RESERVE_REQUESTS
+    core or GraphQL requests. Below GIT_LOW_BUDGET_REQUESTS core requests the fetch
+    turns lean(): single-page workers and no optional calls.
+    """
+
+    def __init__(self, deadline=None, health=None):
+        self.deadline = deadline
+        self.health = health
+        self.rate_limited = False
+        self._stopped = Event()
+
+    def stop(self):
+        self._stopped.set()
+
+    def should_stop(self):
+        if not self._stopped.is_set():
+            if self.deadline is not None and time.monotonic() >= self.deadline:
+                self._stopped.set()
+            elif self._budget_spent():
+                self.rate_limited = True
+                self._stopped.set()
+        return self._stopped.is_set()
+
+    def lean(self):
+        remaining = self.health.remaining() if self.health else None
+        return remaining is not None and remaining < GIT_LOW_BUDGET_REQUESTS
+
+    def _budget_spent(self):
+        if self.health is None:
+            return False
+        for resource in ("core", "graphql"):
+            remaining = self.health.remaining(resource)
+            if remaining is not None and remaining < GIT_RESERVE_REQUESTS:
+                return True
+        return False
 
-# Create a session with connection pooling and retries
+
+def _stopped(control):
+    return control is not None and control.should_stop()
+
+
+def _lean(control):
+    return control is not None and control.lean()
+
+# Create a session with connection pooling, retries and ETag revalidation (persistent HTTP cache)
 def _get_optimized_session():
-    session = requests.Session()
+    session = ConditionalSession()
+    session.hooks["response"].append(record_rate_limit)
     retry_strategy = Retry(
         total=2,
         backoff_factor=0.5,
         status_forcelist=[429, 500, 502, 503, 504]
     )
-    adapter = HTTPAdapter(max_retries=retry_strategy, pool_connections=10, pool_maxsize=20)
+    adapter = HTTPAdapter(max_retries=retry_strategy, pool_connections=10, pool_maxsize=32)  # Repo workers x page workers
     session.mount("http://", adapter)
     session.mount("https://", adapter)
     return session
 
-def _get_github_login_from_fullname(github_token, full_name_from_ui, github_org_key, log_list):
+def _get_github_login_from_fullname(github_token, full_name_from_ui, github_org_key, log_list, session=None):
     """
-    Fetches organization members and their full names to find a matching GitHub login.
+    Resolves a developer's full name (or login) to a GitHub login in the organization.
     Returns the GitHub login (username) if found, otherwise None.
-    Caches the mapping to avoid repeated API calls within the same session.
+    Names come from the org member index (utils.github_identity), built with one paged
+    GraphQL query and persisted on disk, so lookups make no API call once it is loaded.
+    Uses the caller's 'session' when given, otherwise a session of its own that it closes.
     """
-    # Use a simple in-memory cache for this helper function to reduce redundant API calls
-    # within the same application run.
-    if not hasattr(_get_github_login_from_fullname, 'cache'):
-        _get_github_login_from_fullname.cache = {}
-
     # Check for None values to prevent AttributeError
     if not github_token or not full_name_from_ui or not github_org_key:
         log_list.append("[ERROR] Git: Missing required parameters for resolving GitHub login.")
         return None
 
-    cache_key = f"{full_name_from_ui.lower()}_{github_org_key.lower()}"
-
-    if cache_key in _get_github_login_from_fullname.cache:
-        log_list.append(f"[INFO] Git: Resolved '{full_name_from_ui}' from cache to login '{_get_github_login_from_fullname.cache[cache_key]}'.")
-        return _get_github_login_from_fullname.cache[cache_key]
-
-    log_list.append(f"[INFO] Git: Attempting to resolve developer '{full_name_from_ui}' to GitHub login in organization '{github_org_key}'. (API call)")
-    
-    headers = {
-        "Authorization": f"Bearer {github_token}",
-        "Accept": "application/vnd.github+json",
-        "X-GitHub-Api-Version": "2022-11-28"
-    }
-    base_api_url = "https://api.github.com"
-
-    members_url = f"{base_api_url}/orgs/{github_org_key}/members"
-    members_params = {"per_page": 100} # Max per_page. Need pagination for very large orgs.
-
-    try:
-        members_resp = requests.get(members_url, headers=headers, params=members_params)
-        members_resp.raise_for_status()
-        members_list = members_resp.json()
-        log_list.append(f"[INFO] Git API: Fetched {len(members_list)} members for '{github_org_key}'.")
-
-        fullname_to_login_map = {}
-        for member in members_list:
-            login = member.get('login')
-            if login:
-                user_detail_url = f"{base_api_url}/users/{login}"
-                user_detail_resp = requests.get(user_detail_url, headers=headers)
-                user_detail_resp.raise_for_status()
-                user_data = user_detail_resp.json()
-                
-                user_fullname = user_data.get('name') # 'name' field is the full name
-                if user_fullname:
-                    fullname_to_login_map[user_fullname.lower()] = login
-                    # For cases where developer_name is actually the GitHub login
-                    fullname_to_login_map[login.lower()] = login
-                    # log_list.append(f"[DEBUG] Git: Mapped '{user_fullname.lower()}' to login '{login}'.")
-                else:
-                    # If full name is not set, map by login only
-                    fullname_to_login_map[login.lower()] = login
-
-
-        resolved_login = fullname_to_login_map.get(full_name_from_ui.lower())
-        
-        if resolved_login:
-            log_list.append(f"[INFO] Git: Successfully resolved '{full_name_from_ui}' to GitHub login '{resolved_login}'.")
-            _get_github_login_from_fullname.cache[cache_key] = resolved_login # Cache the result
-            return resolved_login
-        else:
-            log_list.append(f"[WARNING] Git: Could not resolve '{full_name_from_ui}' to a GitHub login in organization '{github_org_key}'. Ensure name matches exactly or developer is a member.")
-            _get_github_login_from_fullname.cache[cache_key] = None # Cache failure
-            return None
+    if session is None:
+        with _get_optimized_session() as session:
+            resolved_login = get_github_login(full_name_from_ui, github_token, github_org_key, log_list, session=session)
+    else:
+        resolved_login = get_github_login(full_name_from_ui, github_token, github_org_key, log_list, session=session)
+    if resolved_login:
+        log_list.append(f"[INFO] Git: Successfully resolved '{full_name_from_ui}' to GitHub login '{resolved_login}'.")
+    else:
+        log_list.append(f"[WARNING] Git: Could not resolve '{full_name_from_ui}' to a GitHub login in organization '{github_org_key}'. Ensure name matches exactly or developer is a member.")
+    return resolved_login
 
-    except requests.exceptions.RequestException as e:
-        error_msg = f"Git API: Error fetching organization members or user details for '{github_org_key}': {e}"
-        log_list.append(f"[ERROR] {error_msg}")
-        _get_github_login_from_fullname.cache[cache_key] = None # Cache failure
-        return None
+# --- Loads the org member name -> login index once (from disk when fresh) ---
+def warm_github_member_index(github_token, github_org_key, log_list):
+    if not github_token or not github_org_key:
+        log_list.append("[ERROR] Git: Token/org not provided for the member index.")
+        return {}
+    with _get_optimized_session() as session:
+        return load_member_index(github_token, github_org_key, log_list, session=session)
 
 from datetime import datetime, timedelta
 
@@ -116,27 +147,30 @@ def get_sprint_date_range(
 
     return target_start_date, target_end_date
 
-def fetch_git_metrics_via_api(github_token, developer_name, repos, log_list, github_org_key, sprint_id=None):
+def fetch_git_metrics_via_api(github_token, developer_name, repos, log_list, github_org_key, sprint_id=None, include_files=True):
     log_list.append(f"[INFO] Git: Starting fetch for developer '{developer_name}' across {len(repos)} repositories in org '{github_org_key}'...")
-    log_list.append(f"[DEBUG] Git: Input repos: {repos}")
-    log_list.append(f"[DEBUG] Git: Sprint ID: {sprint_id}")
+    log_debug(log_list, "Git: Input repos: %s", repos)
+    log_debug(log_list, "Git: Sprint ID: %s", sprint_id)
 
-    # Check if GitHub token is valid by testing a simple API call
+    # Token validity and rate-limit budget come from the process-wide health record, which every
+    # GitHub response refreshes; only a token never seen before costs a (free) /rate_limit call
     headers = _build_headers(github_token)
-    try:
-        test_response = requests.get("https://api.github.com/user", headers=headers, timeout=5)
-        if test_response.status_code != 200:
-            log_list.append(f"[ERROR] Git: Invalid GitHub token - using mock data for testing")
+    session = _get_optimized_session()
+    health = get_token_health(github_token)
+    if health.valid is None:
+        try:
+            session.get(GITHUB_RATE_LIMIT_URL, headers=headers, timeout=5)
+        except Exception as e:
+            session.close()
+            log_list.append(f"[ERROR] Git: GitHub API unavailable - using mock data: {e}")
             return _get_mock_git_metrics(developer_name, log_list)
-    except Exception as e:
-        log_list.append(f"[ERROR] Git: GitHub API unavailable - using mock data: {e}")
+    if not health.valid:
+        session.close()
+        log_list.append(f"[ERROR] Git: Invalid GitHub token - using mock data for testing")
         return _get_mock_git_metrics(developer_name, log_list)
 
-    # Limit repos for performance (max 3 for individual metrics)
-    repos = repos[:3] if len(repos) > 3 else repos
-    log_list.append(f"[DEBUG] Git: Processing {len(repos)} repos after limit")
     
-    github_login = _get_github_login_from_fullname(github_token, developer_name, github_org_key, log_list)
+    github_login = _get_github_login_from_fullname(github_token, developer_name, github_org_key, log_list, session=session)
     
     if not github_login:
         log_list.append(f"[WARNING] Git: Failed to resolve GitHub login for '{developer_name}' - trying fallback methods")
@@ -154,33 +188,128 @@ def fetch_git_metrics_via_api(github_token, developer_name, repos, log_list, git
     
     sprint_start_date, sprint_end_date = _calculate_sprint_dates(sprint_id, log_list)
     if sprint_start_date is None and sprint_end_date is None and sprint_id:
+        session.close()
         return {"error": f"Failed to calculate sprint date range for '{sprint_id}'."}
 
-    headers = _build_headers(github_token)
-    metrics = _initialize_metrics()
-    session = _get_optimized_session()
+    plan = _plan_git_fetch(health, repos, include_files, log_list)
+    if not plan["repos"]:
+        session.close()
+        reset_at = datetime.fromtimestamp(health.reset_at() or time.time()).strftime("%H:%M")
+        return {"error": f"GitHub rate limit exhausted until {reset_at}."}
 
-    for repo_full_name in repos:
-        _process_repository(repo_full_name, github_login, headers, sprint_start_date, sprint_end_date, metrics, log_list, session)
+    metrics, processed = _process_repositories(
+        plan["repos"], github_login, headers, sprint_start_date, sprint_end_date, log_list, session, plan["include_files"],
+        max_workers=plan["repo_workers"], page_workers=plan["page_workers"],
+        review_comments=plan["review_comments"], health=health,
+    )
 
     session.close()
-    log_list.append(f"[INFO] Git: Finished processing {len(repos)} repositories. Total commits: {metrics['commits']}")
+    # Repositories left out by the plan or stopped by a budget: callers shouldn't cache this
+    metrics["partial"] = processed < len(repos)
+    log_list.append(f"[INFO] Git: Finished processing {processed} of {len(repos)} repositories. Total commits: {metrics['commits']}")
     return metrics
 
 
+def _plan_git_fetch(health, repos, include_files, log_list):
+    """
+    Sizes the fetch to the token's remaining core budget: below GIT_LOW_BUDGET_REQUESTS,
+    fewer workers and no optional calls (review comments, per-commit file names); repositories
+    beyond what the budget covers at GIT_MIN_REQUESTS_PER_REPO each are left out. That is
+    only a lower bound, so the workers re-check the budget as they go (see _FetchControl).
+    """
+    plan = {
+        "repos": list(repos), "repo_workers": REPO_MAX_WORKERS, "page_workers": PAGE_MAX_WORKERS,
+        "review_comments": True, "include_files": include_files,
+    }
+    remaining = health.remaining()
+    if remaining is None:
+        return plan
+    log_debug(log_list, "Git: %s core requests left in the rate-limit window", remaining)
+
+    if remaining < GIT_LOW_BUDGET_REQUESTS:
+        log_list.append(f"[WARNING] Git: Only {remaining} GitHub requests left - reducing concurrency and skipping optional calls.")
+        plan.update(repo_workers=2, page_workers=1, review_comments=False, include_files=False)
+    affordable = max(0, remaining - GIT_RESERVE_REQUESTS) // GIT_MIN_REQUESTS_PER_REPO
+    if affordable < len(plan["repos"]):
+        log_list.append(f"[WARNING] Git: Rate-limit budget covers {affordable} of {len(plan['repos'])} repositories - skipping the rest.")
+        plan["repos"] = plan["repos"][:affordable]
+    return plan
+
+
+def _process_repositories(repos, github_login, headers, sprint_start_date, sprint_end_date, log_list, session, include_files=True,
+                          max_workers=REPO_MAX_WORKERS, budget_seconds=GIT_FETCH_BUDGET_SECONDS,
+                          page_workers=PAGE_MAX_WORKERS, review_comments=True, health=None):
+    """
+    Processes the repositories concurrently (bounded by max_workers per fetch and by
+    GIT_MAX_CONCURRENT_REPOS across all fetches), each into its own metrics that are merged
+    once it completes. When the 'budget_seconds' time budget runs out, running workers
+    stop before their next request and unfinished repositories are dropped with a warning,
+    as are repositories starting once the token's 'health' is down to GIT_RESERVE_REQUESTS.
+    Returns (metrics, number of repositories merged).
+    """
+    metrics = _initialize_metrics()
+    if not repos:
+        return metrics, 0
+
+    deadline = time.monotonic() + budget_seconds
+    control = _FetchControl(deadline, health)
+
+    def process(repo_full_name):
+        with _repo_slots:
+            if control.should_stop():
+                return None  # Time or rate-limit budget spent while waiting for a slot
+            repo_metrics = _initialize_metrics()
+            _process_repository(repo_full_name, github_login, headers, sprint_start_date, sprint_end_date, repo_metrics, log_list, session,
+                                include_files, page_workers, review_comments, control)
+            return None if control.should_stop() else repo_metrics  # Cut short: partial counts are dropped
+
+    executor = ThreadPoolExecutor(max_workers=min(max_workers, len(repos)))
+    futures = {executor.submit(process, repo): repo for repo in repos}
+    processed = 0
+    try:
+        for future in as_completed(futures, timeout=max(0.0, deadline - time.monotonic())):
+            repo_metrics = future.result()
+            if repo_metrics is None:
+                continue
+            _merge_metrics(metrics, repo_metrics)
+            processed += 1
+    except FuturesTimeout:
+        pending = sorted(repo for future, repo in futures.items() if not future.done())
+        log_list.append(f"[WARNING] Git: Time budget of {budget_seconds}s spent - skipping {len(pending)} unfinished repositories: {pending}")
+    finally:
+        # Running workers stop at their next check; waiting for them keeps them off the
+        # session (closed by the caller), the repo slots and the log once this returns
+        control.stop()
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    if control.rate_limited:
+        log_list.append(f"[WARNING] Git: Rate limit nearly spent - stopped with {len(repos) - processed} of {len(repos)} repositories unfinished.")
+
+    return metrics, processed
+
+
+def _merge_metrics(metrics, repo_metrics):
+    for key, value in repo_metrics.items():
+        if key in ("files_by_repo", "commit_shas_by_repo"):
+            metrics[key].update(value)
+        else:
+            metrics[key] += value
+
+
 def _calculate_sprint_dates(sprint_id, log_list):
     if not sprint_id:
-        log_list.append(f"[DEBUG] Git: No sprint_id provided, using no date filtering")
+        log_debug(log_list, "Git: No sprint_id provided, using no date filtering")
         return None, None
     
-    # Skip date calculation for JQL functions
-    if sprint_id in ["openSprints()", "startOfYear()"]:
-        log_list.append(f"[DEBUG] Git: Skipping date calculation for JQL function: {sprint_id}")
-        return None, None
+    # JQL functions cover a calendar period too, so Git is windowed the same way
+    if sprint_id in JQL_FUNCTION_DURATIONS:
+        dates = get_duration_date_range(JQL_FUNCTION_DURATIONS[sprint_id])
+        log_debug(log_list, "Git: Calculated dates for JQL function %s: %s", sprint_id, dates)
+        return dates
         
     try:
         dates = get_sprint_date_range(sprint_id)
-        log_list.append(f"[DEBUG] Git: Calculated sprint dates for {sprint_id}: {dates}")
+        log_debug(log_list, "Git: Calculated sprint dates for %s: %s", sprint_id, dates)
         return dates
     except Exception as e:
         log_list.append(f"[ERROR] Git: Failed to calculate sprint date range for '{sprint_id}': {e}")
@@ -204,11 +333,93 @@ def _initialize_metrics():
         "prs_created": 0,
         "prs_merged": 0,
         "files_by_repo": {},  # Track files changed by repository
+        "commit_shas_by_repo": {},  # Counted commits, for loading file names on demand
         # "review_comments_given": 0
     }
 
 
-def _process_repository(repo_full_name, github_login, headers, sprint_start_date, sprint_end_date, metrics, log_list, session=None):
+def _fetch_github_page(session, url, headers, params, page):
+    resp = session.get(url, headers=headers, params=dict(params, page=page), timeout=10)
+    resp.raise_for_status()
+    return resp
+
+
+def _iter_github_pages(url, headers, params, session, log_list, max_pages=None, max_workers=PAGE_MAX_WORKERS, control=None):
+    """
+    Yields the pages (lists) of a GitHub listing in page order. The first page is fetched
+    alone; when its Link header names the last page, the rest are fetched in concurrent
+    waves of max_workers pages, otherwise 'next' links are followed one by one. A consumer
+    that stops early leaves at most one wave in flight. Stops after 'max_pages' if set, and
+    before the next request once 'control' is stopped.
+    Raises requests.exceptions.RequestException.
+    """
+    params = dict(params, per_page=GITHUB_PAGE_SIZE)
+    resp = _fetch_github_page(session, url, headers, params, 1)
+    yield resp.json()
+
+    last_page = _link_page(resp, "last")
+    if max_pages:
+        last_page = min(last_page, max_pages) if last_page else None
+    if last_page is None:
+        page = 1
+        while "next" in resp.links and (not max_pages or page < max_pages):
+            if _stopped(control):
+                return
+            resp = session.get(resp.links["next"]["url"], headers=headers, timeout=10)
+            resp.raise_for_status()
+            page += 1
+            yield resp.json()
+        return
+    if last_page < 2:
+        return
+
+    if _lean(control):
+        max_workers = 1  # Low rate-limit budget: don't race ahead of the stop checks
+    log_debug(log_list, "Git: Fetching %s more pages of %s with up to %s workers.", last_page - 1, url, max_workers)
+    with ThreadPoolExecutor(max_workers=min(max_workers, last_page - 1)) as executor:
+        for wave_start in range(2, last_page + 1, max_workers):
+            if _stopped(control):
+                return
+            wave = range(wave_start, min(wave_start + max_workers, last_page + 1))
+            for page_resp in executor.map(lambda page: _fetch_github_page(session, url, headers, params, page), wave):
+                yield page_resp.json()
+
+
+def _link_page(resp, rel):
+    """Page number of the 'rel' link in a response's Link header, if any."""
+    link = resp.links.get(rel)
+    if not link:
+        return None
+    page = parse_qs(urlparse(link["url"]).query).get("page")
+    return int(page[0]) if page else None
+
+
+def _take_until_before(pages, date_field, window_start):
+    """Yields items from pages sorted newest-first, stopping at the first one dated before 'window_start'."""
+    for page in pages:
+        for item in page:
+            item_date = _parse_github_date(item.get(date_field))
+            if window_start and item_date and item_date < window_start:
+                return
+            yield item
+
+
+def _parse_github_date(value):
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).date()
+    except (AttributeError, ValueError):
+        return None
+
+
+def _in_window(value, window_start, window_end):
+    if not window_start or not window_end:
+        return True
+    item_date = _parse_github_date(value)
+    return item_date is not None and window_start <= item_date <= window_end
+
+
+def _process_repository(repo_full_name, github_login, headers, sprint_start_date, sprint_end_date, metrics, log_list, session=None,
+                        include_files=True, page_workers=PAGE_MAX_WORKERS, review_comments=True, control=None):
     if session is None:
         session = requests
     owner_repo = repo_full_name.strip()
@@ -221,46 +432,41 @@ def _process_repository(repo_full_name, github_login, headers, sprint_start_date
     # Initialize files list for this repo
     metrics["files_by_repo"][owner_repo] = set()
     
-    _process_pull_requests(owner_repo, github_login, headers, sprint_start_date, sprint_end_date, metrics, log_list, session)
-    _process_commits(owner_repo, github_login, headers, sprint_start_date, sprint_end_date, metrics, log_list, session)
-    get_review_comments_given(owner_repo, github_login, headers, sprint_start_date, sprint_end_date, metrics, log_list, session)
+    _process_pull_requests(owner_repo, github_login, headers, sprint_start_date, sprint_end_date, metrics, log_list, session, page_workers, control)
+    if not _stopped(control):
+        _process_commits(owner_repo, github_login, headers, sprint_start_date, sprint_end_date, metrics, log_list, session, include_files, page_workers, control)
+    if review_comments and not _lean(control) and not _stopped(control):  # Optional: dropped when the rate-limit budget runs low
+        get_review_comments_given(owner_repo, github_login, headers, sprint_start_date, sprint_end_date, metrics, log_list, session)
     
     # Convert set to sorted list for consistent display
     metrics["files_by_repo"][owner_repo] = sorted(list(metrics["files_by_repo"][owner_repo]))
 
 
-def _process_pull_requests(owner_repo, github_login, headers, sprint_start_date, sprint_end_date, metrics, log_list, session=None):
+def _process_pull_requests(owner_repo, github_login, headers, sprint_start_date, sprint_end_date, metrics, log_list, session=None, page_workers=PAGE_MAX_WORKERS, control=None):
     if session is None:
         session = requests
     pr_url = f"https://api.github.com/repos/{owner_repo}/pulls"
-    # Optimize: Reduce per_page and add date filtering
+    # Most recently updated first, so paging can stop at the first PR last updated before the sprint
     pr_params = {
         "state": "all",
-        "per_page": 50,  # Reduced from 100
         "sort": "updated",
         "direction": "desc"
     }
+    max_pages = None if sprint_start_date else UNWINDOWED_MAX_PAGES
     
     try:
-        pr_resp = session.get(pr_url, headers=headers, params=pr_params, timeout=10)
-        pr_resp.raise_for_status()
-
         login_to_match = github_login.lower() if github_login else None
+        pages = _iter_github_pages(pr_url, headers, pr_params, session, log_list, max_pages=max_pages, max_workers=page_workers, control=control)
+        for pr in _take_until_before(pages, "updated_at", sprint_start_date):
+            pr_login = (pr.get("user") or {}).get("login", "").lower()
 
-        for pr in pr_resp.json():
-            pr_login = pr.get("user", {}).get("login", "").lower()
-
-            if login_to_match:
-                # Developer-level: filter by login
-                if pr_login == login_to_match:
-                    metrics["prs_created"] += 1
-                    if pr.get("merged_at"):
-                        metrics["prs_merged"] += 1
-            else:
-                # Team-level: count all PRs
+            # Developer-level: filter by login; team-level: count all PRs
+            if login_to_match and pr_login != login_to_match:
+                continue
+            if _in_window(pr.get("created_at"), sprint_start_date, sprint_end_date):
                 metrics["prs_created"] += 1
-                if pr.get("merged_at"):
-                    metrics["prs_merged"] += 1
+            if pr.get("merged_at") and _in_window(pr["merged_at"], sprint_start_date, sprint_end_date):
+                metrics["prs_merged"] += 1
 
     except requests.exceptions.RequestException as e:
         if "404" in str(e):
@@ -269,21 +475,20 @@ def _process_pull_requests(owner_repo, github_login, headers, sprint_start_date,
             log_list.append(f"[ERROR] Git API PRs Error for {owner_repo}: {e}")
 
 
-def _process_commits(owner_repo, github_login, headers, sprint_start_date, sprint_end_date, metrics, log_list, session=None):
+def _process_commits(owner_repo, github_login, headers, sprint_start_date, sprint_end_date, metrics, log_list, session=None, include_files=True, page_workers=PAGE_MAX_WORKERS, control=None):
     if session is None:
         session = requests
     commits_url = f"https://api.github.com/repos/{owner_repo}/commits"
 
-    # Optimize: Add author filter and limit results
+    # The sprint window and author filter are applied server-side; every page is read
     commits_params = {
-        "per_page": 50,  # Reduced from 100
         "since": sprint_start_date.isoformat() if sprint_start_date else "1970-01-01",
         "until": sprint_end_date.isoformat() if sprint_end_date else "9999-12-31"
     }
     
     # Debug logging for date filtering
     if sprint_start_date and sprint_end_date:
-        log_list.append(f"[DEBUG] Git: Filtering commits from {sprint_start_date} to {sprint_end_date}")
+        log_debug(log_list, "Git: Filtering commits from %s to %s", sprint_start_date, sprint_end_date)
     else:
         log_list.append(f"[WARNING] Git: No sprint date filtering applied - may return all commits")
     
@@ -292,12 +497,17 @@ def _process_commits(owner_repo, github_login, headers, sprint_start_date, sprin
         commits_params["author"] = github_login
 
     try:
-        commits_resp = session.get(commits_url, headers=headers, params=commits_params, timeout=10)
-        commits_resp.raise_for_status()
-        commits = commits_resp.json()
+        max_pages = None if sprint_start_date else UNWINDOWED_MAX_PAGES
+        commits = [
+            commit
+            for page in _iter_github_pages(commits_url, headers, commits_params, session, log_list, max_pages=max_pages, max_workers=page_workers, control=control)
+            for commit in page
+        ]
         
-        log_list.append(f"[DEBUG] Git: Found {len(commits)} commits in {owner_repo} for processing")
+        log_debug(log_list, "Git: Found %s commits in %s for processing", len(commits), owner_repo)
 
+        login_to_match = github_login.lower() if github_login else None
+        commit_shas = []
         for commit in commits:
             # Skip merge commits (individual work only) - be more precise
             commit_message = commit.get("commit", {}).get("message", "")
@@ -307,21 +517,18 @@ def _process_commits(owner_repo, github_login, headers, sprint_start_date, sprin
             if (len(parents) > 1 or 
                 commit_message.lower().startswith("merge pull request") or 
                 commit_message.lower().startswith("merge branch")):
-                log_list.append(f"[DEBUG] Git: Skipping merge commit: {commit_message[:50]}...")
+                log_debug(log_list, "Git: Skipping merge commit: %s...", commit_message[:50])
                 continue
                 
             author_data = commit.get("author")
             author_login = author_data.get("login", "").lower() if author_data else ""
-            login_to_match = github_login.lower() if github_login else None
 
-            # Process commit details only for matching author
-            if login_to_match and author_login == login_to_match:
-                _process_commit_details(owner_repo, commit.get("sha"), headers, metrics, log_list, session)
-                metrics["commits"] += 1
-            elif not login_to_match:
-                # Team mode: process all non-merge commits
-                _process_commit_details(owner_repo, commit.get("sha"), headers, metrics, log_list, session)
-                metrics["commits"] += 1
+            # Process commit details only for matching author (team mode: all non-merge commits)
+            if not login_to_match or author_login == login_to_match:
+                commit_shas.append(commit.get("sha"))
+
+        _process_commit_stats(owner_repo, commit_shas, headers, metrics, log_list, session, include_files, control)
+        metrics["commits"] += len(commit_shas)
 
     except requests.exceptions.RequestException as e:
         if "404" in str(e):
@@ -330,12 +537,127 @@ def _process_commits(owner_repo, github_login, headers, sprint_start_date, sprin
             log_list.append(f"[ERROR] Git API Commits Error for {owner_repo}: {e}")
 
 
-def _process_commit_details(owner_repo, commit_sha, headers, metrics, log_list, session=None):
+def _process_commit_stats(owner_repo, commit_shas, headers, metrics, log_list, session=None, include_files=True, control=None):
+    """
+    Adds the line and file counts (and with 'include_files' the file names) of
+    'commit_shas' to the metrics, and records the SHAs so file names can be loaded
+    later with fetch_git_changed_files.
+    """
+    commit_shas = [sha for sha in commit_shas if sha]
+    metrics["commit_shas_by_repo"][owner_repo] = commit_shas
+    if not commit_shas:
+        return
+
+    records = _load_commit_records(owner_repo, commit_shas, headers, log_list, session, include_files, control)
+    repo_files = metrics["files_by_repo"].setdefault(owner_repo, set())
+    for record in records.values():
+        metrics["lines_added"] += record["additions"]
+        metrics["lines_deleted"] += record["deletions"]
+        metrics["files_changed"] += record["changed_files"]
+        if include_files and record["files"]:
+            repo_files.update(record["files"])
+
+
+def _load_commit_records(owner_repo, commit_shas, headers, log_list, session=None, include_files=False, control=None):
+    """
+    Returns {sha: CommitStore record} for 'commit_shas'. Commits already in the store cost
+    no API call; the counts of the others come from batched GraphQL lookups
+    (COMMIT_STATS_BATCH_SIZE commits per request). File names are only available per
+    commit, so with 'include_files' the commits whose file names are not stored yet are
+    read individually over REST (as are commits GraphQL could not answer). Everything
+    fetched is added to the store.
+    """
+    if include_files and _lean(control):
+        log_list.append(f"[WARNING] Git: Low rate-limit budget - skipping file names for {owner_repo}.")
+        include_files = False
+    store = get_commit_store()
+    keys = {sha: store.commit_key(owner_repo, sha) for sha in commit_shas}
+    records = store.get_many(keys.values())
+    records = {sha: records[key] for sha, key in keys.items() if key in records}
+    log_debug(log_list, "Git: %s of %s commits in %s from the commit store", len(records), len(commit_shas), owner_repo)
+
+    fetched = {}
+    missing = [sha for sha in commit_shas if sha not in records]
+    if missing:
+        for sha, stats in _fetch_commit_stats(owner_repo, missing, headers, log_list, session, control).items():
+            if stats.get("changedFilesIfAvailable") is None:
+                continue
+            fetched[sha] = {
+                "additions": int(stats.get("additions") or 0),
+                "deletions": int(stats.get("deletions") or 0),
+                "changed_files": int(stats["changedFilesIfAvailable"]),
+                "files": None,
+            }
+        log_debug(log_list, "Git: Batched stats for %s of %s commits in %s", len(fetched), len(missing), owner_repo)
+
+    for commit_sha in commit_shas:
+        record = fetched.get(commit_sha) or records.get(commit_sha)
+        if record and (record["files"] is not None or not include_files):
+            continue
+        if _stopped(control):
+            break
+        detail = _fetch_commit_details(owner_repo, commit_sha, headers, log_list, session)
+        if detail:
+            fetched[commit_sha] = detail
+
+    store.put_many({keys[sha]: record for sha, record in fetched.items()})
+    records.update(fetched)
+    return records
+
+
+def fetch_git_changed_files(github_token, owner_repo, commit_shas, log_list):
+    """
+    Sorted names of the files changed by 'commit_shas' (e.g. a fetch result's
+    commit_shas_by_repo[owner_repo]) - loaded only when a view shows them.
+    """
+    commit_shas = [sha for sha in commit_shas or [] if sha]
+    if not commit_shas:
+        return []
+    session = _get_optimized_session()
+    try:
+        records = _load_commit_records(owner_repo, commit_shas, _build_headers(github_token), log_list, session, include_files=True)
+    finally:
+        session.close()
+    return sorted({filename for record in records.values() for filename in record["files"] or []})
+
+
+def _fetch_commit_stats(owner_repo, commit_shas, headers, log_list, session=None, control=None):
+    """Returns {sha: {"additions", "deletions", "changedFilesIfAvailable"}} for the commits GraphQL resolved."""
+    if session is None:
+        session = requests
+    owner, name = owner_repo.split("/")
+    stats_by_sha = {}
+    for start in range(0, len(commit_shas), COMMIT_STATS_BATCH_SIZE):
+        if _stopped(control):
+            break
+        batch = commit_shas[start:start + COMMIT_STATS_BATCH_SIZE]
+        lookups = " ".join(
+            f'c{i}: object(oid: "{sha}") {{ ... on Commit {{ oid additions deletions changedFilesIfAvailable }} }}'
+            for i, sha in enumerate(batch)
+        )
+        query = f"query($owner: String!, $name: String!) {{ repository(owner: $owner, name: $name) {{ {lookups} }} }}"
+        try:
+            resp = session.post(
+                GITHUB_GRAPHQL_URL, headers=headers,
+                json={"query": query, "variables": {"owner": owner, "name": name}}, timeout=30,
+            )
+            resp.raise_for_status()
+            payload = resp.json()
+        except (requests.exceptions.RequestException, ValueError) as e:
+            log_list.append(f"[WARNING] Git: Batched commit stats failed for {owner_repo} - reading commits individually: {e}")
+            continue
+        if payload.get("errors"):
+            log_debug(log_list, "Git: GraphQL commit stats errors for %s: %s", owner_repo, payload["errors"])
+        for commit in ((payload.get("data") or {}).get("repository") or {}).values():
+            if commit and commit.get("oid"):
+                stats_by_sha[commit["oid"]] = commit
+    return stats_by_sha
+
+
+def _fetch_commit_details(owner_repo, commit_sha, headers, log_list, session=None):
+    """Returns a commit's CommitStore record from the REST commit endpoint, or None on error."""
     if session is None:
         session = requests
-    if not commit_sha:
-        log_list.append("[WARNING] Skipping commit with empty SHA.")
-        return
 
     detail_url = f"https://api.github.com/repos/{owner_repo}/commits/{commit_sha}"
     
@@ -344,31 +666,19 @@ def _process_commit_details(owner_repo, commit_sha, headers, metrics, log_list,
         detail_resp.raise_for_status()
         detail_data = detail_resp.json()
 
-        stats = detail_data.get("stats", {})
-        files = detail_data.get("files", [])
+        stats = detail_data.get("stats") or {}
+        files = detail_data.get("files") or []
+        return {
+            "additions": int(stats.get("additions", 0)),
+            "deletions": int(stats.get("deletions", 0)),
+            "changed_files": len(files),
+            "files": [file_info["filename"] for file_info in files if file_info.get("filename")],
+        }
 
-        # Defensive updates
-        try:
-            metrics["lines_added"] += int(stats.get("additions", 0))
-            metrics["lines_deleted"] += int(stats.get("deletions", 0))
-            metrics["files_changed"] += len(files)
-            
-            # Track files changed by repository
-            if owner_repo not in metrics["files_by_repo"]:
-                metrics["files_by_repo"][owner_repo] = set()
-            
-            for file_info in files:
-                filename = file_info.get("filename")
-                if filename:
-                    metrics["files_by_repo"][owner_repo].add(filename)
-                    
-        except Exception as e:
-            log_list.append(f"[ERROR] Metric update error for commit {commit_sha[:7]}: {e}")
-
-    except requests.exceptions.RequestException as e:
+    except (requests.exceptions.RequestException, ValueError, TypeError) as e:
         log_list.append(f"[ERROR] Git API Commit Detail Error for {owner_repo}/{commit_sha[:7]}: {e}")
         # Don't fail silently - this helps debug why commit details aren't showing
-
+        return None
 
 
 def get_review_comments_given(owner_repo, github_login, headers, sprint_start_date, sprint_end_date, metrics, log_list, session=None):
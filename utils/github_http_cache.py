@@ -0,0 +1,193 @@
+import atexit
+import hashlib
+import json
+import sqlite3
+import time
+import zlib
+from threading import Lock
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from utils.local_cache import get_cache_path
+
+HTTP_CACHE_FILE = "github_http_cache.sqlite3"
+HTTP_CACHE_MAX_AGE_SECONDS = 30 * 24 * 3600  # Entries unused for this long are pruned
+HTTP_CACHE_PRUNE_INTERVAL_SECONDS = 24 * 3600
+HTTP_CACHE_WRITE_BATCH = 50  # Buffered writes per transaction
+# Response headers kept with a cached body; everything else comes from the fresh 304
+STORED_HEADERS = ("Content-Type", "Link", "ETag", "Last-Modified")
+BODY_HEADERS = ("content-length", "content-encoding", "transfer-encoding")
+
+
+class GitHubHttpCache:
+    """
+    Persistent validator cache for GitHub GET requests: the ETag / Last-Modified, kept
+    headers and zlib-compressed body of the last 200 response, keyed by URL (params
+    included), Accept header and a hash of the Authorization header, so tokens never
+    share or store each other's credentials.
+    One long-lived connection is shared by all threads (SQLite serializes access; WAL
+    lets other processes read while we write). Writes are buffered and committed in
+    batches of HTTP_CACHE_WRITE_BATCH, or on flush()/close().
+    """
+
+    def __init__(self, path=None):
+        self.path = path or get_cache_path(HTTP_CACHE_FILE)
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, headers TEXT, body BLOB, used_at REAL)"
+            )
+        self._pending_puts = {}  # key -> row not yet written
+        self._pending_touches = {}  # key -> used_at not yet written
+        self._pending_lock = Lock()  # Guards the buffers only, never held during I/O
+        self._flush_lock = Lock()  # One write transaction at a time on the shared connection
+        self._pruned_at = 0
+        self.flush()
+
+    @staticmethod
+    def cache_key(url, headers):
+        auth = hashlib.sha256((headers.get("Authorization") or "").encode("utf-8")).hexdigest()
+        return hashlib.sha256(f"{url}\n{headers.get('Accept', '')}\n{auth}".encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """Returns (etag, last_modified, headers, body) for a stored response, or None."""
+        with self._pending_lock:
+            row = self._pending_puts.get(key)
+        if row:
+            row = row[1:5]
+        else:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, headers, body FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if not row:
+            return None
+        return row[0], row[1], json.loads(row[2]), zlib.decompress(row[3])
+
+    def put(self, key, response):
+        headers = {name: response.headers[name] for name in STORED_HEADERS if name in response.headers}
+        row = (
+            key, response.headers.get("ETag"), response.headers.get("Last-Modified"),
+            json.dumps(headers), zlib.compress(response.content), time.time(),
+        )
+        with self._pending_lock:
+            self._pending_puts[key] = row
+            self._pending_touches.pop(key, None)
+        self._flush_if_full()
+
+    def touch(self, key):
+        with self._pending_lock:
+            self._pending_touches[key] = time.time()
+        self._flush_if_full()
+
+    def _flush_if_full(self):
+        with self._pending_lock:
+            full = len(self._pending_puts) + len(self._pending_touches) >= HTTP_CACHE_WRITE_BATCH
+        if full:
+            self.flush()
+
+    def flush(self):
+        """Commits the buffered writes in one transaction, pruning stale entries once a day."""
+        with self._flush_lock:
+            with self._pending_lock:
+                puts, self._pending_puts = self._pending_puts, {}
+                touches, self._pending_touches = self._pending_touches, {}
+            prune = time.time() - self._pruned_at > HTTP_CACHE_PRUNE_INTERVAL_SECONDS
+            if not puts and not touches and not prune:
+                return
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO responses (key, etag, last_modified, headers, body, used_at) VALUES (?, ?, ?, ?, ?, ?)",
+                    puts.values(),
+                )
+                self._conn.executemany(
+                    "UPDATE responses SET used_at = ? WHERE key = ?",
+                    [(used_at, key) for key, used_at in touches.items()],
+                )
+                if prune:
+                    self._conn.execute("DELETE FROM responses WHERE used_at < ?", (time.time() - HTTP_CACHE_MAX_AGE_SECONDS,))
+            if prune:
+                self._pruned_at = time.time()
+
+    def close(self):
+        self.flush()
+        self._conn.close()
+
+
+class ConditionalSession(requests.Session):
+    """
+    Session that revalidates GitHub GETs against the GitHubHttpCache: a stored response
+    is requested with If-None-Match / If-Modified-Since, and a 304 (which GitHub does not
+    count against the rate limit) is answered from the stored body as a normal 200
+    response with 'from_cache' set. Other methods pass through unchanged.
+    """
+
+    def __init__(self, cache=None):
+        super().__init__()
+        self.cache = cache or get_github_http_cache()
+
+    def request(self, method, url, params=None, headers=None, **kwargs):
+        if method.upper() != "GET":
+            return super().request(method, url, params=params, headers=headers, **kwargs)
+
+        merged_headers = CaseInsensitiveDict(self.headers)
+        merged_headers.update(headers or {})
+        full_url = requests.Request("GET", url, params=params).prepare().url
+        key = self.cache.cache_key(full_url, merged_headers)
+        stored = self.cache.get(key)
+
+        request_headers = dict(headers or {})
+        if stored:
+            etag, last_modified = stored[0], stored[1]
+            if etag:
+                request_headers["If-None-Match"] = etag
+            if last_modified:
+                request_headers["If-Modified-Since"] = last_modified
+
+        response = super().request(method, url, params=params, headers=request_headers, **kwargs)
+        if response.status_code == 304 and stored:
+            self.cache.touch(key)
+            return _cached_response(response, stored[2], stored[3])
+        response.from_cache = False
+        if response.status_code == 200 and ("ETag" in response.headers or "Last-Modified" in response.headers):
+            self.cache.put(key, response)
+        return response
+
+    def close(self):
+        self.cache.flush()  # The cache outlives the session; commit what this session buffered
+        super().close()
+
+
+def _cached_response(not_modified, stored_headers, body):
+    """Builds a 200 response from a stored body, with the 304's fresh headers (rate limit, validators)."""
+    response = requests.Response()
+    response.status_code = 200
+    response.reason = "OK"
+    response.headers = CaseInsensitiveDict(stored_headers)
+    response.headers.update(
+        {name: value for name, value in not_modified.headers.items() if name.lower() not in BODY_HEADERS}
+    )
+    response._content = body
+    response.encoding = get_encoding_from_headers(response.headers)
+    response.url = not_modified.url
+    response.request = not_modified.request
+    response.elapsed = not_modified.elapsed
+    response.from_cache = True
+    return response
+
+
+_http_cache = None
+_http_cache_lock = Lock()
+
+
+def get_github_http_cache():
+    """Returns the process-wide GitHubHttpCache."""
+    global _http_cache
+    with _http_cache_lock:
+        if _http_cache is None:
+            _http_cache = GitHubHttpCache()
+            atexit.register(_http_cache.close)
+        return _http_cache
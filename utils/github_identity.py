@@ -0,0 +1,100 @@
+import time
+from threading import Lock
+
+import requests
+
+from utils.local_cache import load_json_snapshot, save_json_snapshot
+
+GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+MEMBER_INDEX_TTL_SECONDS = 7 * 24 * 3600
+MEMBER_PAGE_SIZE = 100  # GraphQL connection maximum
+
+MEMBERS_QUERY = """
+query($org: String!, $cursor: String) {
+  organization(login: $org) {
+    membersWithRole(first: %d, after: $cursor) {
+      pageInfo { hasNextPage endCursor }
+      nodes { login name }
+    }
+  }
+}
+""" % MEMBER_PAGE_SIZE
+
+# In-memory copies of the on-disk indexes: org -> (loaded_at, {lowercased name or login: login})
+_member_indexes = {}
+_member_indexes_lock = Lock()
+
+
+def _member_index_file(github_org_key):
+    return f"github_member_index_{github_org_key.lower()}.json"
+
+
+def load_member_index(github_token, github_org_key, log_list, force_refresh=False, session=None):
+    """
+    Returns the org's full name / login -> GitHub login index, loading it from disk or
+    rebuilding it with one paged GraphQL query (login and name together) when missing
+    or older than MEMBER_INDEX_TTL_SECONDS.
+    """
+    with _member_indexes_lock:
+        loaded = _member_indexes.get(github_org_key)
+        if not force_refresh and loaded and time.time() - loaded[0] < MEMBER_INDEX_TTL_SECONDS:
+            return loaded[1]
+
+        index_file = _member_index_file(github_org_key)
+        index = None if force_refresh else load_json_snapshot(index_file, MEMBER_INDEX_TTL_SECONDS)
+        if index is not None:
+            log_list.append(f"[INFO] Git Identity: Loaded {len(index)} member names for '{github_org_key}' from the local index.")
+        else:
+            index = _build_member_index(github_token, github_org_key, log_list, session)
+            if index is None:
+                return loaded[1] if loaded else {}  # Keep serving the previous index if the rebuild failed
+            save_json_snapshot(index_file, index)
+
+        _member_indexes[github_org_key] = (time.time(), index)
+        return index
+
+
+def get_github_login(full_name, github_token, github_org_key, log_list, session=None):
+    """Resolves a developer's full name (or login) to a GitHub login from the member index."""
+    index = load_member_index(github_token, github_org_key, log_list, session=session)
+    return index.get(full_name.strip().lower())
+
+
+def _build_member_index(github_token, github_org_key, log_list, session=None):
+    log_list.append(f"[INFO] Git Identity: Building member index for '{github_org_key}' (GraphQL)...")
+    headers = {"Authorization": f"Bearer {github_token}", "Accept": "application/json"}
+    http = session or requests
+    index = {}
+    cursor = None
+    try:
+        while True:
+            response = http.post(
+                GITHUB_GRAPHQL_URL,
+                headers=headers,
+                json={"query": MEMBERS_QUERY, "variables": {"org": github_org_key, "cursor": cursor}},
+                timeout=30,
+            )
+            response.raise_for_status()
+            payload = response.json()
+            if payload.get("errors"):
+                log_list.append(f"[ERROR] Git Identity: GraphQL errors for '{github_org_key}': {payload['errors']}")
+                return None
+            members = ((payload.get("data") or {}).get("organization") or {}).get("membersWithRole") or {}
+            for member in members.get("nodes") or []:
+                login = member.get("login")
+                if not login:
+                    continue
+                # A developer name may also be the GitHub login itself
+                index[login.lower()] = login
+                if member.get("name"):
+                    index.setdefault(member["name"].strip().lower(), login)
+            page_info = members.get("pageInfo") or {}
+            if not page_info.get("hasNextPage"):
+                break
+            cursor = page_info.get("endCursor")
+    except requests.exceptions.RequestException as e:
+        log_list.append(f"[ERROR] Git Identity: Failed to list members of '{github_org_key}': {e}")
+        return None
+
+    log_list.append(f"[INFO] Git Identity: Indexed {len(index)} member names and logins for '{github_org_key}'.")
+    return index
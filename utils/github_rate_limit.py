@@ -0,0 +1,78 @@
+import hashlib
+import time
+from threading import Lock
+
+GITHUB_RATE_LIMIT_URL = "https://api.github.com/rate_limit"  # Free: does not count against the limit
+
+
+class TokenHealth:
+    """
+    What the process knows about one GitHub token: whether GitHub accepted it and, per
+    rate-limit resource ("core", "graphql", ...), the limit, remaining requests and reset
+    time from the latest response's X-RateLimit-* headers.
+    """
+
+    def __init__(self):
+        self.valid = None  # None until a response has been seen
+        self.budgets = {}  # resource -> (limit, remaining, reset epoch seconds)
+        self._lock = Lock()
+
+    def update(self, response):
+        with self._lock:
+            if response.status_code == 401:
+                self.valid = False
+            elif response.status_code < 400:
+                self.valid = True
+            remaining = response.headers.get("X-RateLimit-Remaining")
+            if remaining is None:
+                return
+            try:
+                self.budgets[response.headers.get("X-RateLimit-Resource", "core")] = (
+                    int(response.headers.get("X-RateLimit-Limit", 0)),
+                    int(remaining),
+                    int(response.headers.get("X-RateLimit-Reset", 0)),
+                )
+            except ValueError:
+                pass
+
+    def remaining(self, resource="core"):
+        """Requests left for 'resource', or None when unknown (or the window has already reset)."""
+        with self._lock:
+            budget = self.budgets.get(resource)
+        if not budget or budget[2] <= time.time():
+            return None
+        return budget[1]
+
+    def reset_at(self, resource="core"):
+        with self._lock:
+            budget = self.budgets.get(resource)
+        return budget[2] if budget else None
+
+
+_token_health = {}  # sha256 of the Authorization header -> TokenHealth
+_token_health_lock = Lock()
+
+
+def _auth_hash(authorization):
+    return hashlib.sha256((authorization or "").encode("utf-8")).hexdigest()
+
+
+def get_token_health(github_token):
+    """Returns the process-wide TokenHealth of 'github_token'."""
+    return _health_for(_auth_hash(f"Bearer {github_token}"))
+
+
+def _health_for(auth_hash):
+    with _token_health_lock:
+        health = _token_health.get(auth_hash)
+        if health is None:
+            health = _token_health[auth_hash] = TokenHealth()
+        return health
+
+
+def record_rate_limit(response, *args, **kwargs):
+    """requests response hook: refreshes the token's health from every GitHub response."""
+    authorization = response.request.headers.get("Authorization") if response.request else None
+    if authorization:
+        _health_for(_auth_hash(authorization)).update(response)
+    return response
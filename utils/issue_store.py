@@ -0,0 +1,101 @@
+import atexit
+import json
+import sqlite3
+import zlib
+from threading import Lock
+
+from utils.local_cache import get_cache_path
+
+ISSUE_STORE_FILE = "jira_issues.sqlite3"
+
+
+class IssueStore:
+    """
+    Persistent local copy of Jira issues (fields + changelog) keyed by issue key and
+    'updated' timestamp, plus the last sync time and matching keys for each JQL query.
+    Issue payloads are stored as zlib-compressed JSON.
+    One long-lived connection is shared by all threads, one call at a time under the lock.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or get_cache_path(ISSUE_STORE_FILE)
+        self._lock = Lock()
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS issues ("
+                "key TEXT PRIMARY KEY, id TEXT, updated TEXT, data BLOB)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS queries ("
+                "jql TEXT PRIMARY KEY, last_sync TEXT, issue_keys TEXT)"
+            )
+
+    def get_query(self, jql):
+        """Returns (last_sync ISO string, [issue keys]) for a synced query, or None."""
+        with self._lock:
+            row = self._conn.execute("SELECT last_sync, issue_keys FROM queries WHERE jql = ?", (jql,)).fetchone()
+        if not row:
+            return None
+        return row[0], json.loads(row[1])
+
+    def save_query(self, jql, last_sync, issue_keys):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO queries (jql, last_sync, issue_keys) VALUES (?, ?, ?)",
+                (jql, last_sync, json.dumps(list(issue_keys))),
+            )
+
+    def upsert_issues(self, issues):
+        rows = [
+            (
+                issue["key"],
+                issue.get("id"),
+                issue.get("fields", {}).get("updated"),
+                zlib.compress(json.dumps(issue, separators=(",", ":")).encode("utf-8")),
+            )
+            for issue in issues if issue.get("key")
+        ]
+        if not rows:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO issues (key, id, updated, data) VALUES (?, ?, ?, ?)", rows)
+
+    def get_updated(self, keys):
+        """Returns {key: updated} for the stored issues among 'keys'."""
+        return {key: updated for key, updated, _ in self._select(keys, "key, updated, NULL")}
+
+    def get_issues(self, keys):
+        """Returns the stored issues for 'keys', in the given order, skipping unknown keys."""
+        by_key = {key: data for key, data in self._select(keys, "key, data")}
+        return [json.loads(zlib.decompress(by_key[key])) for key in keys if key in by_key]
+
+    def _select(self, keys, columns):
+        keys = list(keys)
+        rows = []
+        with self._lock:
+            # Stay well under SQLite's bound-parameter limit
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows.extend(self._conn.execute(f"SELECT {columns} FROM issues WHERE key IN ({placeholders})", chunk))
+        return rows
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_issue_store = None
+_issue_store_lock = Lock()
+
+
+def get_issue_store():
+    """Returns the process-wide IssueStore."""
+    global _issue_store
+    with _issue_store_lock:
+        if _issue_store is None:
+            _issue_store = IssueStore()
+            atexit.register(_issue_store.close)
+        return _issue_store
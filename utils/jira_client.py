@@ -0,0 +1,110 @@
+import random
+import time
+from email.utils import parsedate_to_datetime
+from threading import Lock
+
+import requests
+from requests.adapters import HTTPAdapter
+
+CONNECT_TIMEOUT_SECONDS = 5
+READ_TIMEOUT_SECONDS = 30
+REQUEST_DEADLINE_SECONDS = 90  # Upper bound for one call, retries and waits included
+MAX_RETRIES = 4
+RETRY_BACKOFF_SECONDS = 0.5
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+POOL_MAXSIZE = 32  # Enough for the search, dev-panel and user-listing worker pools
+
+
+class JiraClient:
+    """
+    Shared Jira REST client: one keep-alive connection pool (gzip-encoded responses),
+    per-attempt connect/read timeouts, and retries with exponential backoff on
+    connection errors and 429/5xx responses that honor Retry-After. Every call
+    finishes within its deadline; failures raise requests.exceptions.RequestException
+    (HTTPError for the last bad response, Timeout once the deadline is spent).
+    Thread-safe for concurrent calls.
+    """
+
+    def __init__(self, pool_maxsize=POOL_MAXSIZE):
+        self.session = requests.Session()
+        self.session.headers["Accept-Encoding"] = "gzip, deflate"
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def get(self, url, headers=None, params=None, timeout=READ_TIMEOUT_SECONDS, deadline=REQUEST_DEADLINE_SECONDS):
+        return self.request("GET", url, headers=headers, params=params, timeout=timeout, deadline=deadline)
+
+    def post(self, url, headers=None, params=None, json=None, timeout=READ_TIMEOUT_SECONDS, deadline=REQUEST_DEADLINE_SECONDS):
+        return self.request("POST", url, headers=headers, params=params, json=json, timeout=timeout, deadline=deadline)
+
+    def request(self, method, url, headers=None, params=None, json=None, timeout=READ_TIMEOUT_SECONDS, deadline=REQUEST_DEADLINE_SECONDS):
+        """Sends the request and returns the successful response (raise_for_status already applied)."""
+        expires_at = time.monotonic() + deadline
+        attempt = 0
+        while True:
+            remaining = expires_at - time.monotonic()
+            if remaining <= 0:
+                raise requests.exceptions.Timeout(f"Jira {method} {url} exceeded its {deadline}s deadline")
+            attempt_timeout = (min(CONNECT_TIMEOUT_SECONDS, remaining), min(timeout, remaining))
+            try:
+                response = self.session.request(method, url, headers=headers, params=params, json=json, timeout=attempt_timeout)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if attempt >= MAX_RETRIES or not self._wait(_backoff(attempt), expires_at):
+                    raise
+                attempt += 1
+                continue
+
+            if response.status_code in RETRY_STATUSES and attempt < MAX_RETRIES:
+                delay = _retry_after(response)
+                if delay is None:
+                    delay = _backoff(attempt)
+                if self._wait(delay, expires_at):
+                    response.close()
+                    attempt += 1
+                    continue
+            response.raise_for_status()
+            return response
+
+    @staticmethod
+    def _wait(delay, expires_at):
+        """Sleeps for 'delay' seconds unless that would leave no time before the deadline."""
+        if time.monotonic() + delay >= expires_at:
+            return False
+        time.sleep(delay)
+        return True
+
+    def close(self):
+        self.session.close()
+
+
+def _backoff(attempt):
+    return RETRY_BACKOFF_SECONDS * (2 ** attempt) * random.uniform(0.5, 1.0)
+
+
+def _retry_after(response):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date), if present."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+_client = None
+_client_lock = Lock()
+
+
+def get_jira_client():
+    """Process-wide JiraClient, so every Jira call reuses the same warm connections."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = JiraClient()
+        return _client
@@ -0,0 +1,141 @@
+import numpy as np
+import pandas as pd
+
+from utils.changelog_analyzer import DONE_STATUSES, analyze_changelog
+from utils.jira_time import parse_jira_timestamps
+from utils.time_in_status import TimeInStatusEngine
+
+PERCENTILES = (50, 85, 95)
+
+ISSUE_COLUMNS = [
+    "key", "id", "updated", "assignee_account_id", "assignee_name", "in_sprint", "story_points",
+    "is_closed", "is_bug", "created", "in_progress_date", "done_date",
+    "failed_qa_count", "logged_time", "assignee_logged_time",
+]
+STATUS_EVENT_COLUMNS = ["key", "assignee_account_id", "status", "seconds"]
+
+
+def issues_to_frames(issues, in_sprint=None, log_list=None):
+    """
+    Flattens issues into a typed issue frame (one row per issue) and a status-event frame
+    (one row per stay of an issue in a status, with its seconds). 'in_sprint' is an
+    optional predicate; rows failing it are kept (they count as assigned) but flagged.
+    Each changelog is analysed once here.
+    """
+    issue_rows = []
+    status_rows = []
+    for issue in issues:
+        fields = issue.get("fields", {})
+        assignee = fields.get("assignee") or {}
+        account_id = assignee.get("accountId")
+        analysis = analyze_changelog(issue.get("changelog", {}).get("histories", []), log_list=log_list)
+
+        issue_rows.append((
+            issue.get("key"),
+            issue.get("id"),
+            fields.get("updated"),
+            account_id,
+            assignee.get("displayName"),
+            in_sprint(issue) if in_sprint else True,
+            _story_points(fields.get("customfield_10014")),
+            (fields.get("status") or {}).get("name", "").lower() in DONE_STATUSES,
+            (fields.get("issuetype") or {}).get("name", "").lower() == "bug",
+            fields.get("created"),
+            analysis["in_progress_date"],
+            analysis["done_date"],
+            analysis["failed_qa_count"],
+            analysis["logged_time"],
+            analysis["logged_time_by_author"].get(account_id, 0) if account_id else 0,
+        ))
+        for status, seconds in analysis["status_intervals"]:
+            status_rows.append((issue.get("key"), account_id, status, seconds))
+
+    issue_frame = pd.DataFrame.from_records(issue_rows, columns=ISSUE_COLUMNS)
+    for column in ("created", "in_progress_date", "done_date"):
+        issue_frame[column] = parse_jira_timestamps(issue_frame[column])
+    issue_frame = issue_frame.astype({
+        "in_sprint": bool, "story_points": "float64", "is_closed": bool, "is_bug": bool,
+        "failed_qa_count": "int64", "logged_time": "int64", "assignee_logged_time": "int64",
+    })
+    status_frame = pd.DataFrame.from_records(status_rows, columns=STATUS_EVENT_COLUMNS).astype({"seconds": "int64"})
+    return issue_frame, status_frame
+
+
+def summarize_issue_frame(issue_frame, status_frame=None, repos_by_issue=None, logged_time_column="logged_time", status_engine=None):
+    """
+    Vectorized equivalent of summarize_metrics over an issue frame, plus lead/cycle time
+    percentiles (p50/p85/p95). Only 'in_sprint' rows contribute to the metrics;
+    all_issues_count counts every row. In-sprint status intervals are recorded into
+    'status_engine' (a TimeInStatusEngine scope; a fresh one by default).
+    """
+    if status_engine is None:
+        status_engine = TimeInStatusEngine().scope()
+    done = issue_frame[issue_frame["in_sprint"]]
+    closed = done[done["is_closed"]]
+    lead_times = (done["done_date"] - done["created"]).dt.days.dropna()
+    cycle_times = (done["done_date"] - done["in_progress_date"]).dt.days.dropna()
+
+    dev_branches = set()
+    if repos_by_issue:
+        for issue_id in done["id"]:
+            dev_branches.update(repos_by_issue.get(issue_id, ()))
+
+    time_in_status = {}
+    if status_frame is not None and not status_frame.empty:
+        in_sprint_events = status_frame[status_frame["key"].isin(done["key"])]
+        for status, seconds in in_sprint_events.groupby("status")["seconds"]:
+            time_in_status[status] = int(seconds.sum())
+            status_engine.add_many(status, seconds.to_numpy())
+
+    result = {
+        "all_issues_count": int(len(issue_frame)),
+        "story_points_done": float(done["story_points"].sum()),
+        "story_points_closed": float(closed["story_points"].sum()),
+        "tickets_closed": int((~closed["is_bug"]).sum()),
+        "bugs_closed": int(closed["is_bug"].sum()),
+        "avg_lead_time": round(float(lead_times.mean()), 2) if not lead_times.empty else "N/A",
+        "avg_cycle_time": round(float(cycle_times.mean()), 2) if not cycle_times.empty else "N/A",
+        "dev_branches": list(dev_branches),
+        "failed_qa_count": int(done["failed_qa_count"].sum()),
+        "logged_time": int(done[logged_time_column].sum()),
+        "time_in_status": time_in_status,
+        "time_in_status_percentiles": status_engine.report(),
+    }
+    result.update(percentile_summary("lead_time", lead_times))
+    result.update(percentile_summary("cycle_time", cycle_times))
+    return result
+
+
+def summarize_issue_frame_by_assignee(issue_frame, status_frame=None, repos_by_issue=None, member_names=None):
+    """
+    Per-assignee summaries keyed by accountId (display names aren't unique). Each carries
+    its 'account_id' and 'name' (member_names[accountId], else the Jira display name).
+    """
+    member_names = member_names or {}
+    members = {}
+    for account_id, member_frame in issue_frame.dropna(subset=["assignee_account_id"]).groupby("assignee_account_id", sort=False):
+        member_status = None
+        if status_frame is not None:
+            member_status = status_frame[status_frame["assignee_account_id"] == account_id]
+        summary = summarize_issue_frame(member_frame, member_status, repos_by_issue, "assignee_logged_time")
+        summary["account_id"] = account_id
+        summary["name"] = member_names.get(account_id) or member_frame["assignee_name"].iloc[0] or account_id
+        members[account_id] = summary
+    return members
+
+
+def percentile_summary(prefix, values):
+    """{prefix}_p50/_p85/_p95 for a numeric Series, 'N/A' when empty."""
+    if values.empty:
+        return {f"{prefix}_p{p}": "N/A" for p in PERCENTILES}
+    return {
+        f"{prefix}_p{p}": round(float(value), 2)
+        for p, value in zip(PERCENTILES, np.percentile(values.to_numpy(), PERCENTILES))
+    }
+
+
+def _story_points(value):
+    try:
+        return float(value) if value is not None else 0.0
+    except (TypeError, ValueError):
+        return 0.0
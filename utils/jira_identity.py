@@ -0,0 +1,157 @@
+import time
+from threading import Lock
+
+import requests
+
+from utils.jira_client import get_jira_client
+from utils.local_cache import load_json_snapshot, save_json_snapshot
+
+USER_INDEX_FILE = "jira_user_index.json"
+USER_INDEX_TTL_SECONDS = 7 * 24 * 3600
+USER_INDEX_RETRY_SECONDS = 5 * 60  # After a failed rebuild, wait this long before trying again
+USER_PAGE_SIZE = 1000
+
+# In-memory copy of the on-disk index: lowercased display name -> [accountId, ...]
+_user_index = None
+_user_index_loaded_at = 0
+_user_index_ttl = USER_INDEX_TTL_SECONDS  # USER_INDEX_RETRY_SECONDS while serving after a failed rebuild
+_user_index_lock = Lock()  # Guards the in-memory index (held only to read or swap it)
+_user_index_build_lock = Lock()  # One rebuild at a time; lookups keep the previous index meanwhile
+
+# Names looked up individually after missing the index: lowercased name -> last lookup time
+_missed_lookups = {}
+MISSED_LOOKUP_INTERVAL_SECONDS = 15 * 60
+
+
+def load_user_index(base_url, headers, log_list, developer_names=None, force_refresh=False):
+    """
+    Returns the display name -> accountIds index, loading it from disk or rebuilding it
+    from the bulk user listing when missing or older than USER_INDEX_TTL_SECONDS.
+    The rebuild runs outside the index lock; while one is in progress other callers keep
+    the previous index. A failed rebuild keeps the previous index (or an empty one) for
+    USER_INDEX_RETRY_SECONDS, so lookups go straight to the per-name search meanwhile
+    instead of queueing behind another full listing. 'developer_names' (e.g. everyone in
+    teams.txt) are checked against a rebuilt index.
+    """
+    global _user_index, _user_index_loaded_at, _user_index_ttl
+    with _user_index_lock:
+        current = _user_index
+        if (not force_refresh and current is not None
+                and time.time() - _user_index_loaded_at < _user_index_ttl):
+            return current
+
+    if not _user_index_build_lock.acquire(blocking=current is None):
+        return current  # Another caller is rebuilding - serve the stale index until it is swapped in
+    try:
+        with _user_index_lock:
+            if not force_refresh and _user_index is not current:
+                return _user_index  # Rebuilt while we waited
+
+        index = None if force_refresh else load_json_snapshot(USER_INDEX_FILE, USER_INDEX_TTL_SECONDS)
+        if index is not None:
+            log_list.append(f"[INFO] JIRA Identity: Loaded {len(index)} users from the local index.")
+        else:
+            index = _build_user_index(base_url, headers, log_list)
+            if index is None:
+                # Keep serving the previous index, and don't retry the listing for a while
+                with _user_index_lock:
+                    _user_index = current or {}
+                    _user_index_loaded_at = time.time()
+                    _user_index_ttl = USER_INDEX_RETRY_SECONDS
+                    return _user_index
+            save_json_snapshot(USER_INDEX_FILE, index)
+            _report_unresolved(index, developer_names, log_list)
+
+        with _user_index_lock:
+            _user_index = index
+            _user_index_loaded_at = time.time()
+            _user_index_ttl = USER_INDEX_TTL_SECONDS
+        return index
+    finally:
+        _user_index_build_lock.release()
+
+
+def get_account_id(developer_name, base_url, headers, log_list):
+    """
+    Resolves a developer's display name to a Jira accountId from the index (no network call
+    once loaded). A name missing from the index (new in teams.txt, renamed in Jira) is looked
+    up once through /user/search, at most every MISSED_LOOKUP_INTERVAL_SECONDS, and added.
+    """
+    index = load_user_index(base_url, headers, log_list)
+    account_ids = index.get(developer_name.strip().lower(), [])
+    if not account_ids:
+        account_ids = _lookup_missed_user(developer_name, base_url, headers, log_list)
+    if len(account_ids) > 1:
+        log_list.append(f"[WARNING] JIRA Identity: '{developer_name}' matches {len(account_ids)} Jira users - using the first.")
+    return account_ids[0] if account_ids else None
+
+
+def _lookup_missed_user(developer_name, base_url, headers, log_list):
+    global _user_index
+    name = developer_name.strip().lower()
+    now = time.time()
+    with _user_index_lock:
+        if now - _missed_lookups.get(name, 0) < MISSED_LOOKUP_INTERVAL_SECONDS:
+            return []
+        _missed_lookups[name] = now
+
+    try:
+        users = get_jira_client().get(
+            f"{base_url}/rest/api/3/user/search", headers=headers, params={"query": developer_name}
+        ).json()
+    except requests.exceptions.RequestException as e:
+        log_list.append(f"[ERROR] JIRA Identity: User search for '{developer_name}' failed: {e}")
+        return []
+    account_ids = [
+        user["accountId"] for user in users
+        if user.get("accountId") and user.get("accountType", "atlassian") == "atlassian" and user.get("active", True)
+    ]
+    if not account_ids:
+        return []
+
+    log_list.append(f"[INFO] JIRA Identity: '{developer_name}' was missing from the index - found by user search.")
+    with _user_index_lock:
+        # Copy on write, so callers iterating the previous index are unaffected
+        index = dict(_user_index or {})
+        index[name] = account_ids
+        _user_index = index
+    # Kept in memory only: rewriting the snapshot would push back the full rebuild
+    return account_ids
+
+
+def _build_user_index(base_url, headers, log_list):
+    log_list.append("[INFO] JIRA Identity: Building user index from the bulk user listing...")
+    index = {}
+    start_at = 0
+    client = get_jira_client()
+    try:
+        while True:
+            users = client.get(
+                f"{base_url}/rest/api/3/users/search",
+                headers=headers,
+                params={"startAt": start_at, "maxResults": USER_PAGE_SIZE},
+            ).json()
+            if not users:
+                break
+            for user in users:
+                if user.get("accountType") != "atlassian" or not user.get("active", True):
+                    continue
+                display_name = (user.get("displayName") or "").strip().lower()
+                if display_name:
+                    index.setdefault(display_name, []).append(user["accountId"])
+            start_at += len(users)
+    except requests.exceptions.RequestException as e:
+        log_list.append(f"[ERROR] JIRA Identity: Failed to list users: {e}")
+        return None
+
+    log_list.append(f"[INFO] JIRA Identity: Indexed {len(index)} users.")
+    return index
+
+
+def _report_unresolved(index, developer_names, log_list):
+    for name in developer_names or []:
+        matches = len(index.get(name.strip().lower(), []))
+        if matches == 0:
+            log_list.append(f"[WARNING] JIRA Identity: Developer '{name}' not found in Jira users.")
+        elif matches > 1:
+            log_list.append(f"[WARNING] JIRA Identity: Developer '{name}' matches {matches} Jira users.")
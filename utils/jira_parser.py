@@ -1,22 +1,315 @@
+import asyncio
+import time
 import pandas as pd
 import requests
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import chain
+from threading import Lock
 import statistics
 import base64
-from dateutil import parser
+import hashlib
 from jira import JIRA
 from jira.exceptions import JIRAError
+from utils.changelog_analyzer import analyze_changelog
+from utils.jira_client import CONNECT_TIMEOUT_SECONDS, MAX_RETRIES, READ_TIMEOUT_SECONDS, get_jira_client
+from utils.jira_time import parse_jira_timestamp
+from utils.log_buffer import log_debug
+from utils.issue_store import get_issue_store
+from utils.jira_identity import get_account_id, load_user_index
+from utils.local_cache import load_json_snapshot, save_json_snapshot
+from utils.tempo_parser import fetch_tempo_worklogs
+from utils.sprint_index import SprintIndex
+from utils.time_in_status import TimeInStatusEngine
+from utils.jira_frames import issues_to_frames, summarize_issue_frame, summarize_issue_frame_by_assignee, percentile_summary
 
 JIRA_URL = "https://truxinc.atlassian.net"
+# Token-paginated search (nextPageToken); the legacy offset endpoint (/rest/api/3/search)
+# still serves key listings, whose pages can be fetched concurrently
+JIRA_SEARCH_URL = f"{JIRA_URL}/rest/api/3/search/jql"
+
+SEARCH_FIELDS = "summary,issuetype,assignee,created,updated,comment,customfield_10014,status,customfield_10000,customfield_10001,customfield_10010"
+SEARCH_PAGE_SIZE = 100
+SEARCH_MAX_WORKERS = 4  # Concurrent offset page requests after the first page
+CHANGELOG_MAX_WORKERS = 4  # Concurrent bulk changelog requests
+# Token-paged searches size each page so a response stays near these targets
+SEARCH_TARGET_SECONDS = 3.0
+SEARCH_TARGET_BYTES = 2 * 1024 * 1024
+SEARCH_MIN_PAGE_SIZE = 25
+SEARCH_MAX_PAGE_SIZE = 5000
+CHANGELOG_BULK_ISSUES = 1000  # Issue ids per bulk changelog request (API limit)
+CHANGELOG_BULK_PAGE_SIZE = 1000
+DEV_PANEL_MAX_WORKERS = 8  # Concurrent dev-panel lookups per fetch
+PIPELINE_MAX_CONCURRENCY = 16  # In-flight Jira calls in the async fetch pipeline
+USER_DIRECTORY_MAX_WORKERS = 4  # Concurrent user-listing pages per wave
+USER_DIRECTORY_TTL_SECONDS = 24 * 3600
+# JQL 'updated >=' is evaluated in the Jira user's timezone, so delta syncs overlap the
+# previous sync by a day to never miss an update; re-fetching a few issues is cheap.
+DELTA_SYNC_OVERLAP = timedelta(days=1)
+
+# Dev-panel repositories per issue id, stored with the issue's 'updated' timestamp
+# so unchanged issues are never looked up twice within the same process.
+_DEV_PANEL_CACHE = {}
+_DEV_PANEL_CACHE_LOCK = Lock()
+
+# Learned page size per (fields, expand), so later searches start at the adapted size
+_SEARCH_PAGE_SIZES = {}
+_SEARCH_PAGE_SIZES_LOCK = Lock()
+
+
+def _fetch_search_page(client, url, headers, params, start_at):
+    page_params = dict(params, startAt=start_at)
+    return client.get(url, headers=headers, params=page_params).json()
+
+
+def _iter_search_pages(url, headers, params, log_list, max_workers=SEARCH_MAX_WORKERS):
+    """
+    Yields pages of issues for a Jira search. Token-paginated searches (/search/jql) are
+    delegated to _iter_token_search_pages. On the legacy offset endpoint the first page is
+    fetched alone to learn the total; the remaining pages are fetched concurrently (bounded
+    by max_workers) and yielded in completion order. If the offset endpoint is gone
+    (404/410), the search falls back to the token pager. Raises requests.exceptions.RequestException.
+    """
+    if url.endswith("/search/jql"):
+        yield from _iter_token_search_pages(url, headers, params, log_list)
+        return
+
+    client = get_jira_client()
+    try:
+        first_page = _fetch_search_page(client, url, headers, params, 0)
+    except requests.exceptions.HTTPError as e:
+        if e.response is None or e.response.status_code not in (404, 410):
+            raise
+        log_list.append("[WARNING] JIRA Search: Offset search endpoint unavailable - paging with nextPageToken instead.")
+        yield from _iter_token_search_pages(f"{url}/jql", headers, params, log_list)
+        return
+    issues = first_page.get("issues", [])
+    total = first_page.get("total", len(issues))
+    # Jira may cap maxResults (e.g. when expanding changelogs), so page by what it returned
+    page_size = first_page.get("maxResults") or len(issues) or params.get("maxResults", SEARCH_PAGE_SIZE)
+    log_list.append(f"[INFO] JIRA Search: {total} issues matched, page size {page_size}.")
+    yield issues
+
+    starts = list(range(len(issues), total, page_size)) if issues else []
+    if not starts:
+        return
+
+    log_debug(log_list, "JIRA Search: Fetching %s more pages with up to %s workers.", len(starts), max_workers)
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(starts))) as executor:
+        futures = [executor.submit(_fetch_search_page, client, url, headers, params, start) for start in starts]
+        for future in as_completed(futures):
+            yield future.result().get("issues", [])
+
+
+def _iter_token_search_pages(url, headers, params, log_list):
+    """
+    Yields pages from the nextPageToken search. Pages are inherently sequential, so each
+    page is sized from the previous response (see _next_page_size) to keep round trips
+    few without risking timeouts. Raises requests.exceptions.RequestException.
+    """
+    client = get_jira_client()
+    size_key = (params.get("fields"), params.get("expand"))
+    with _SEARCH_PAGE_SIZES_LOCK:
+        page_size = _SEARCH_PAGE_SIZES.get(size_key, params.get("maxResults", SEARCH_PAGE_SIZE))
+    page_params = {key: value for key, value in params.items() if key not in ("startAt", "maxResults")}
+    fetched = 0
+    max_page_size = SEARCH_MAX_PAGE_SIZE
+    while True:
+        started = time.monotonic()
+        response = client.get(url, headers=headers, params=dict(page_params, maxResults=page_size))
+        elapsed = time.monotonic() - started
+        data = response.json()
+        issues = data.get("issues", [])
+        fetched += len(issues)
+        yield issues
+
+        next_page_token = data.get("nextPageToken")
+        if data.get("isLast", not next_page_token) or not next_page_token or not issues:
+            break
+        if len(issues) < page_size:
+            max_page_size = max(len(issues), SEARCH_MIN_PAGE_SIZE)  # Jira capped this page; don't ask for more
+        page_size = min(_next_page_size(page_size, len(issues), elapsed, len(response.content)), max_page_size)
+        log_debug(log_list, "JIRA Search: %s issues so far, next page size %s", fetched, page_size)
+        page_params["nextPageToken"] = next_page_token
+
+    with _SEARCH_PAGE_SIZES_LOCK:
+        _SEARCH_PAGE_SIZES[size_key] = page_size
+    log_list.append(f"[INFO] JIRA Search: {fetched} issues matched, last page size {page_size}.")
+
+
+def _next_page_size(page_size, returned, elapsed, response_bytes):
+    """Page size that would have hit SEARCH_TARGET_SECONDS / SEARCH_TARGET_BYTES, within 2x of the current one."""
+    ideal = min(
+        SEARCH_TARGET_SECONDS * returned / max(elapsed, 1e-3),
+        SEARCH_TARGET_BYTES * returned / max(response_bytes, 1),
+    )
+    page_size = min(max(int(ideal), page_size // 2), page_size * 2)
+    return min(max(page_size, SEARCH_MIN_PAGE_SIZE), SEARCH_MAX_PAGE_SIZE)
+
+
+def _iter_synced_issue_pages(url, headers, params, log_list, store=None):
+    """
+    Yields pages of issues for a search through the local issue store. The first sync of
+    a query streams the full search into the store; later syncs only fetch issues updated
+    since the last sync (plus a lean key listing to pick up issues that joined or left the
+    query without being updated) and yield the query's issues from the store.
+    """
+    store = store or get_issue_store()
+    jql = params["jql"]
+    sync_started = datetime.now(timezone.utc)
+    synced = store.get_query(jql)
+
+    # Searches stay lean: a requested changelog expansion is served by the bulk
+    # changelog endpoint, and only for issues whose stored copy is outdated.
+    expand = [part for part in params.get("expand", "").split(",") if part]
+    with_changelog = "changelog" in expand
+    params = {key: value for key, value in params.items() if key != "expand"}
+    if len(expand) > int(with_changelog):
+        params["expand"] = ",".join(part for part in expand if part != "changelog")
+
+    def store_page(page):
+        if with_changelog:
+            _attach_changelogs(page, headers, log_list, store)
+        store.upsert_issues(page)
+        return page
+
+    if synced is None:
+        log_list.append("[INFO] JIRA Store: No local copy of this query yet - running full sync.")
+        issue_keys = []
+        for page in _iter_search_pages(url, headers, params, log_list):
+            store_page(page)
+            issue_keys.extend(issue["key"] for issue in page)
+            yield page
+        store.save_query(jql, sync_started.isoformat(), issue_keys)
+        return
+
+    last_sync = datetime.fromisoformat(synced[0])
+    since = (last_sync - DELTA_SYNC_OVERLAP).strftime("%Y/%m/%d %H:%M")
+    delta_params = dict(params, jql=f'({jql}) AND updated >= "{since}"')
+    log_list.append(f"[INFO] JIRA Store: Delta sync for issues updated since {since}.")
+    changed = [issue for page in _iter_search_pages(url, headers, delta_params, log_list) for issue in store_page(page)]
+
+    # Lean listing of the query's current members (keys only, no changelog). It reports a
+    # total up front, so it goes through the offset endpoint to fetch its pages concurrently.
+    member_params = {"jql": jql, "maxResults": 1000, "fields": "id"}
+    member_url = url[:-len("/jql")] if url.endswith("/search/jql") else url
+    issue_keys = [issue["key"] for page in _iter_search_pages(member_url, headers, member_params, log_list) for issue in page]
+
+    stored = store.get_updated(issue_keys)
+    missing = [key for key in issue_keys if key not in stored]
+    for i in range(0, len(missing), SEARCH_PAGE_SIZE):
+        chunk = missing[i:i + SEARCH_PAGE_SIZE]
+        missing_params = dict(params, jql=f"key in ({','.join(chunk)})")
+        for page in _iter_search_pages(url, headers, missing_params, log_list):
+            store_page(page)
+
+    store.save_query(jql, sync_started.isoformat(), issue_keys)
+    log_list.append(f"[INFO] JIRA Store: {len(changed)} changed and {len(missing)} new issues merged; {len(issue_keys)} issues in query.")
+    yield store.get_issues(issue_keys)
+
+
+def _attach_changelogs(issues, headers, log_list, store):
+    """
+    Sets issue["changelog"] on a page of lean issues: reused from the store when the stored
+    copy has the same 'updated' timestamp, otherwise fetched through the bulk changelog endpoint.
+    """
+    stored_updated = store.get_updated([issue["key"] for issue in issues])
+    fresh_keys = [
+        issue["key"] for issue in issues
+        if stored_updated.get(issue["key"]) and stored_updated[issue["key"]] == issue.get("fields", {}).get("updated")
+    ]
+    stored_changelogs = {issue["key"]: issue.get("changelog") for issue in store.get_issues(fresh_keys)}
+
+    pending = []
+    for issue in issues:
+        changelog = stored_changelogs.get(issue["key"])
+        if changelog is not None:
+            issue["changelog"] = changelog
+        else:
+            pending.append(issue)
+    log_debug(log_list, "JIRA Changelog: %s reused from the store, %s to fetch", len(issues) - len(pending), len(pending))
+    if not pending:
+        return
+
+    histories_by_id = _fetch_bulk_changelogs([issue["id"] for issue in pending], headers, log_list)
+    for issue in pending:
+        histories = histories_by_id.get(str(issue["id"]), [])
+        issue["changelog"] = {"startAt": 0, "maxResults": len(histories), "total": len(histories), "histories": histories}
+
+
+def _fetch_bulk_changelogs(issue_ids, headers, log_list, max_workers=CHANGELOG_MAX_WORKERS):
+    """
+    Complete changelogs for 'issue_ids' via POST /rest/api/3/changelog/bulkfetch (token paged),
+    as {issue id: histories in chronological order}. Unlike expand=changelog on a search,
+    long histories are not truncated. Raises requests.exceptions.RequestException.
+    """
+    chunks = [issue_ids[i:i + CHANGELOG_BULK_ISSUES] for i in range(0, len(issue_ids), CHANGELOG_BULK_ISSUES)]
+    histories_by_id = {}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as executor:
+        for chunk_histories in executor.map(lambda chunk: _fetch_changelog_chunk(chunk, headers), chunks):
+            for issue_id, histories in chunk_histories.items():
+                histories_by_id.setdefault(issue_id, []).extend(histories)
+
+    for issue_id, histories in histories_by_id.items():
+        histories_by_id[issue_id] = _sort_histories([_normalize_history(history) for history in histories])
+    log_list.append(f"[INFO] JIRA Changelog: Bulk-fetched changelogs for {len(issue_ids)} issues.")
+    return histories_by_id
+
+
+def _fetch_changelog_chunk(issue_ids, headers):
+    client = get_jira_client()
+    url = f"{JIRA_URL}/rest/api/3/changelog/bulkfetch"
+    body = {"issueIdsOrKeys": [str(issue_id) for issue_id in issue_ids], "maxResults": CHANGELOG_BULK_PAGE_SIZE}
+    histories_by_id = {}
+    while True:
+        data = client.post(url, headers=dict(headers, **{"Content-Type": "application/json"}), json=body).json()
+        for entry in data.get("issueChangeLogs", []):
+            histories_by_id.setdefault(str(entry.get("issueId")), []).extend(entry.get("changeHistories", []))
+        next_page_token = data.get("nextPageToken")
+        if not next_page_token:
+            return histories_by_id
+        body = dict(body, nextPageToken=next_page_token)
+
+
+def _normalize_history(history):
+    # The bulk endpoint sends 'created' as epoch milliseconds; the analyzers expect Jira's timestamp strings
+    created = history.get("created")
+    if isinstance(created, (int, float)):
+        created_at = datetime.fromtimestamp(created / 1000, tz=timezone.utc)
+        history = dict(history, created=created_at.strftime("%Y-%m-%dT%H:%M:%S.") + f"{created_at.microsecond // 1000:03d}+0000")
+    return history
+
+
+def _sort_histories(histories):
+    try:
+        return sorted(histories, key=lambda history: parse_jira_timestamp(history.get("created")))
+    except (TypeError, ValueError):
+        return histories
+
 
 # --- JIRA Connection Function ---
+# Connected clients are reused per (url, user, token) so repeat calls skip the connection probe.
+_jira_clients = {}
+_jira_clients_lock = Lock()
+
+
 def connect_to_jira_streamlit(url, username, api_token, log_list):
+    client_key = (url, username, api_token)
+    with _jira_clients_lock:
+        jira = _jira_clients.get(client_key)
+    if jira is not None:
+        log_list.append(f"[INFO] JIRA Connect: Reusing connection to {url} for user {username}.")
+        return jira
+
     log_list.append(f"[INFO] JIRA Connect: Attempting connection to {url} for user {username}...")
     try:
         jira_options = {'server': url}
-        jira = JIRA(options=jira_options, basic_auth=(username, api_token))
+        jira = JIRA(options=jira_options, basic_auth=(username, api_token),
+                    timeout=(CONNECT_TIMEOUT_SECONDS, READ_TIMEOUT_SECONDS), max_retries=MAX_RETRIES)
         jira.myself() # Test connection
         log_list.append(f"[INFO] JIRA Connect: Successfully connected to Jira as {username}.")
+        with _jira_clients_lock:
+            _jira_clients[client_key] = jira
         return jira
     except JIRAError as e:
         log_list.append(f"[ERROR] JIRA Connect: Error connecting to Jira: Status {e.status_code} - {e.text}")
@@ -26,7 +319,19 @@ def connect_to_jira_streamlit(url, username, api_token, log_list):
         return None
 
 # --- Get All JIRA Users Function ---
-def get_all_jira_users_streamlit(jira_url, jira_username, jira_api_token, log_list, filter_domain=None):
+# Syncs the user directory with concurrent page requests and keeps the filtered
+# human-user set as a compact on-disk snapshot that is only refreshed when stale.
+def get_all_jira_users_streamlit(jira_url, jira_username, jira_api_token, log_list, filter_domain=None, force_refresh=False):
+    snapshot_file = _user_directory_snapshot_file(jira_url, filter_domain)
+    if not force_refresh:
+        snapshot = load_json_snapshot(snapshot_file, USER_DIRECTORY_TTL_SECONDS)
+        if snapshot is not None:
+            log_list.append(f"[INFO] JIRA Users: Loaded {len(snapshot)} users from the directory snapshot{get_filter_status_message(filter_domain)}.")
+            return {
+                account_id: {'displayName': display_name, 'emailAddress': email}
+                for account_id, (display_name, email) in snapshot.items()
+            }
+
     log_list.append(f"[INFO] JIRA Users: Fetching all active Jira users from {jira_url}...")
     jira_instance = connect_to_jira_streamlit(jira_url, jira_username, jira_api_token, log_list)
     if not jira_instance: 
@@ -36,20 +341,38 @@ def get_all_jira_users_streamlit(jira_url, jira_username, jira_api_token, log_li
     all_users = {}
     start_at = 0
     max_results = 50 
-
-    while True:
-        users_page = fetch_users_page(jira_instance, start_at, max_results, log_list)
-        if not users_page:
-            break
-        process_users_page(users_page, all_users, filter_domain, log_list)
-        start_at += max_results
-        if len(users_page) < max_results:
-            break
+    complete = False
+    failed = False
+
+    # The listing has no total, so pages are requested in concurrent waves until a short page
+    with ThreadPoolExecutor(max_workers=USER_DIRECTORY_MAX_WORKERS) as executor:
+        while not complete and not failed:
+            starts = [start_at + i * max_results for i in range(USER_DIRECTORY_MAX_WORKERS)]
+            pages = executor.map(lambda start: fetch_users_page(jira_instance, start, max_results, log_list), starts)
+            for users_page in pages:
+                if users_page is None:
+                    failed = True  # Keep what we have but don't snapshot a partial directory
+                    break
+                process_users_page(users_page, all_users, filter_domain, log_list)
+                if len(users_page) < max_results:
+                    complete = True
+                    break
+            start_at += len(starts) * max_results
+
+    if complete:
+        save_json_snapshot(snapshot_file, {
+            account_id: [user['displayName'], user['emailAddress']] for account_id, user in all_users.items()
+        })
 
     log_list.append(f"[INFO] JIRA Users: Fetched {len(all_users)} active human Jira users{get_filter_status_message(filter_domain)}.")
     return all_users
 
 
+def _user_directory_snapshot_file(jira_url, filter_domain):
+    digest = hashlib.sha1(f"{jira_url}|{(filter_domain or '').lower()}".encode("utf-8")).hexdigest()[:12]
+    return f"jira_users_{digest}.json"
+
+
 def fetch_users_page(jira_instance, start_at, max_results, log_list):
     try:
         return jira_instance.search_users(query='*', startAt=start_at, maxResults=max_results)
@@ -141,20 +464,6 @@ def count_comments_from_fields(issue, log_list=None):
             log_list.append(f"[ERROR] Failed to count comments: {e}")
         return 0
 
-def count_transitions(changelog_histories, from_status, to_status, log_list):
-    count = 0
-    try:
-        for history in changelog_histories:
-            for item in history.get('items', []):
-                if item.get('field') == 'status':
-                    from_str = item.get('fromString', '')
-                    to_str = item.get('toString', '')
-                    if from_str.lower() == from_status.lower() and to_str.lower() == to_status.lower():
-                        count += 1
-    except Exception as e:
-        log_list.append(f"[ERROR] Exception while counting transitions from '{from_status}' to '{to_status}': {e}")
-    return count
-
 
 def seconds_to_dhm(seconds):
     days = seconds // 86400
@@ -173,29 +482,7 @@ def seconds_to_hm(seconds_str):
     return f"{hours} hrs {minutes} mins"
 
 def get_logged_time(histories, log_list, developer_account_id=None):
-    total_logged_time = 0
-    # print(f"developer_account_id = {developer_account_id}")
-    for history in histories:
-        author = history.get("author", {})
-        account_id = author.get("accountId")
-
-        for item in history.get("items", []):
-            if item.get("field") == "timespent":
-                try:
-                    to_seconds = int(item.get("to", 0))
-
-                    if developer_account_id:
-                        # Only accumulate time if author matches the developer
-                        if account_id == developer_account_id:
-                            total_logged_time = to_seconds
-                    else:
-                        # Return first available timespent regardless of author
-                        return to_seconds
-
-                except (TypeError, ValueError):
-                    continue  # skip invalid values
-
-    return total_logged_time if developer_account_id else 0
+    return analyze_changelog(histories, developer_account_id, log_list)["logged_time"]
 
 # def get_logged_time(histories, developer_account_id=None):
 #     logged_time = 0
@@ -273,43 +560,96 @@ def get_logged_time(histories, log_list, developer_account_id=None):
 
 # --- Helper function to process a list of issues and extract metrics ---
 # MODIFIED: Added 'headers' parameter
-def _process_jira_issues(issues, sprint_id, log_list, headers, developer_account_id=None):
-    metrics = initialize_metrics()
-    log_list.append(f"[DEBUG] Processing {len(issues)} issues with sprint_id: {sprint_id}")
+# Sprint membership is resolved once for the whole fetch through a SprintIndex.
+# With 'worklogs' (a Tempo WorklogIndex) logged time is the developer's worklogs on the
+# in-sprint issues instead of the changelog 'timespent' values.
+def _process_jira_issues(issues, sprint_id, log_list, headers, developer_account_id=None, with_dev_panels=True, status_engine=None, worklogs=None):
+    metrics = initialize_metrics(status_engine)
+    log_debug(log_list, "Processing issues with sprint_id: %s", sprint_id)
     
+    processed_issues = list(issues)
+    in_sprint_keys = SprintIndex(processed_issues).issue_keys(sprint_id) if sprint_id else None
+    filtered_issues = []
     filtered_count = 0
-    for issue in issues:
-        if sprint_id and not _filter_issues_by_sprint(issue, sprint_id):
-            log_list.append(f"[DEBUG] Issue {issue.get('key')} filtered out (not in sprint {sprint_id})")
+    for issue in processed_issues:
+        if in_sprint_keys is not None and issue.get("key") not in in_sprint_keys:
+            log_debug(log_list, "Issue %s filtered out (not in sprint %s)", issue.get('key'), sprint_id)
             continue
         filtered_count += 1
+        filtered_issues.append(issue)
         _update_metrics(issue, metrics, headers, log_list, developer_account_id)
     
-    log_list.append(f"[DEBUG] {filtered_count} issues passed sprint filter")
-    return summarize_metrics(metrics, issues)
+    log_debug(log_list, "%s of %s issues passed sprint filter", filtered_count, len(processed_issues))
+    if with_dev_panels:
+        _process_dev_panels(filtered_issues, headers, log_list, metrics["dev_branches"])
+    result = summarize_metrics(metrics, processed_issues, log_list)
+    if worklogs is not None:
+        result["logged_time"] = worklogs.logged_time(developer_account_id, [issue["id"] for issue in filtered_issues])
+    return result
 
 
-def _filter_issues_by_sprint(issue, sprint_id):
-    # Skip filtering for openSprints() and startOfYear() - they're handled by JQL
-    if sprint_id in ["openSprints()", "startOfYear()"]:
-        return True
-        
-    issue_sprints = issue.get("fields", {}).get("customfield_10010", [])
-    return any(
-        sprint_id.lower() in str(s.get("name", "")).lower() or sprint_id == str(s.get("id", ""))
-        for s in issue_sprints if isinstance(s, dict)
-    ) if isinstance(issue_sprints, list) else sprint_id.lower() in issue_sprints.lower()
+# Team engine: one pass over the team's issues yields the team summary and a
+# summarize_metrics result per assignee under result["members"] (keyed by accountId).
+# Aggregation is columnar (see utils/jira_frames.py).
+def _process_team_issues(issues, sprint_id, log_list, headers, member_names=None, with_dev_panels=True, status_engine=None, worklogs=None):
+    log_debug(log_list, "Processing team issues with sprint_id: %s", sprint_id)
+    in_sprint = None
+    if sprint_id:
+        issues = list(issues)
+        in_sprint_keys = SprintIndex(issues).issue_keys(sprint_id)
+        in_sprint = lambda issue: issue.get("key") in in_sprint_keys
+    issue_frame, status_frame = issues_to_frames(issues, in_sprint, log_list)
+
+    in_sprint_rows = issue_frame.loc[issue_frame["in_sprint"], ["id", "updated"]]
+    log_debug(log_list, "%s of %s team issues passed sprint filter", len(in_sprint_rows), len(issue_frame))
+    # The dev-panel stage only needs each issue's id and 'updated' timestamp
+    filtered_issues = [
+        {"id": issue_id, "fields": {"updated": updated}}
+        for issue_id, updated in in_sprint_rows.itertuples(index=False)
+    ]
+    repos_by_issue = _lookup_dev_panels(filtered_issues, headers, log_list) if with_dev_panels else {}
+
+    result = summarize_issue_frame(issue_frame, status_frame, repos_by_issue, status_engine=status_engine)
+    result["members"] = summarize_issue_frame_by_assignee(issue_frame, status_frame, repos_by_issue, member_names)
+    if worklogs is not None:
+        in_sprint_ids = list(in_sprint_rows["id"])
+        result["logged_time"] = worklogs.logged_time(None, in_sprint_ids)
+        for member in result["members"].values():
+            member["logged_time"] = worklogs.logged_time(member["account_id"], in_sprint_ids)
+    log_debug(log_list, "Final story points calculation: %s from %s issues", result["story_points_done"], result["all_issues_count"])
+    return result
+
 
+# Sprint history: buckets each issue under every requested sprint it belongs to, by exact
+# sprint name ("<team name> <sprint id>", as in the JQL) from customfield_10010.
+def _split_issues_by_sprint(issues, sprint_ids, team_name):
+    sprint_index = SprintIndex(issues)
+    position = {issue.get("key"): i for i, issue in enumerate(issues)}
+    buckets = {}
+    for sprint_id in sprint_ids:
+        keys = sorted(sprint_index.exact_name_keys(f"{team_name} {sprint_id}"), key=position.get)
+        buckets[sprint_id] = [issues[position[key]] for key in keys]
+    return buckets
 
-def _update_metrics(issue, metrics, headers, log_list, developer_account_id=None):
+
+# 'analysis' lets callers that update several metric sets share one changelog pass.
+def _update_metrics(issue, metrics, headers, log_list, developer_account_id=None, analysis=None):
     changelog = issue.get("changelog", {}).get("histories", [])
 
     # print("[DEBUG] issue type:", type(issue))
     # print("[DEBUG] issue content:", issue)
     # metrics["comments_count"] += count_comments_from_fields(issue, log_list)
-    metrics["failed_qa_count"] += count_transitions(changelog, "In Testing", "Rejected", log_list)
-    metrics["logged_time"] += get_logged_time(changelog, log_list, developer_account_id)
-    _process_dev_panel(issue, headers, log_list, metrics["dev_branches"])
+    # Single pass over the changelog for every changelog-derived metric
+    if analysis is None:
+        analysis = analyze_changelog(changelog, log_list=log_list)
+    metrics["failed_qa_count"] += analysis["failed_qa_count"]
+    if developer_account_id:
+        metrics["logged_time"] += analysis["logged_time_by_author"].get(developer_account_id, 0)
+    else:
+        metrics["logged_time"] += analysis["logged_time"]
+    for status, seconds in analysis["time_in_status"].items():
+        metrics["time_in_status"][status] = metrics["time_in_status"].get(status, 0) + seconds
+    metrics["status_engine"].add_intervals(analysis["status_intervals"])
 
     value = issue.get("fields", {}).get("customfield_10014")
     issue_key = issue.get("key", "Unknown")
@@ -317,26 +657,75 @@ def _update_metrics(issue, metrics, headers, log_list, developer_account_id=None
         points = float(value) if value is not None else 0.0
         metrics["story_points"] += points
         if points > 0:
-            log_list.append(f"[DEBUG] JIRA: Added {points} story points from issue {issue_key}")
+            log_debug(log_list, "JIRA: Added %s story points from issue %s", points, issue_key)
     except (TypeError, ValueError):
+        points = 0.0
         metrics["story_points"] += 0.0
-        log_list.append(f"[DEBUG] JIRA: No story points for issue {issue_key} (value: {value})")
+        log_debug(log_list, "JIRA: No story points for issue %s (value: %s)", issue_key, value)
+
+    _update_closure_metrics(issue, metrics, points)
+    _update_time_metrics(issue, metrics, analysis["in_progress_date"], analysis["done_date"])
 
-    _update_closure_metrics(issue, metrics)
-    in_progress_date, done_date = _calculate_times(changelog)
-    _update_time_metrics(issue, metrics, in_progress_date, done_date)
 
+def _process_dev_panels(issues, headers, log_list, dev_branches, max_workers=DEV_PANEL_MAX_WORKERS):
+    for repos in _lookup_dev_panels(issues, headers, log_list, max_workers).values():
+        dev_branches.update(repos)
 
-def _process_dev_panel(issue, headers, log_list, dev_branches):
+
+def _lookup_dev_panels(issues, headers, log_list, max_workers=DEV_PANEL_MAX_WORKERS):
+    """
+    Batched dev-panel stage: serves unchanged issues from the cache and looks up the
+    rest through a bounded worker pool on the shared Jira client.
+    Returns {issue id: repository names}.
+    """
+    repos_by_issue = {}
+    pending = []
+    for issue in issues:
+        cached_repos = _get_cached_dev_panel(issue)
+        if cached_repos is None:
+            pending.append(issue)
+        else:
+            repos_by_issue[issue["id"]] = cached_repos
+
+    log_debug(log_list, "JIRA Dev Panel: %s cached, %s to fetch", len(repos_by_issue), len(pending))
+    if not pending:
+        return repos_by_issue
+
+    client = get_jira_client()
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(pending))) as executor:
+        lookups = executor.map(lambda issue: _fetch_dev_panel_repositories(issue, headers, log_list, client), pending)
+        for issue, repos in zip(pending, lookups):
+            repos_by_issue[issue["id"]] = repos
+    return repos_by_issue
+
+
+def _get_cached_dev_panel(issue):
+    updated = issue.get("fields", {}).get("updated")
+    with _DEV_PANEL_CACHE_LOCK:
+        cached = _DEV_PANEL_CACHE.get(issue.get("id"))
+    if updated and cached and cached[0] == updated:
+        return cached[1]
+    return None
+
+
+def _fetch_dev_panel_repositories(issue, headers, log_list, client=None):
+    if client is None:
+        client = get_jira_client()
     dev_panel_url = f"{JIRA_URL}/rest/dev-status/1.0/issue/detail"
     dev_panel_params = {"issueId": issue["id"], "applicationType": "GitHub", "dataType": "repository"}
+    repos = set()
     try:
-        dev_resp = requests.get(dev_panel_url, headers=headers, params=dev_panel_params)
-        dev_resp.raise_for_status()
-        dev_data = dev_resp.json()
-        _extract_repositories(dev_data, dev_branches)
+        dev_data = client.get(dev_panel_url, headers=headers, params=dev_panel_params, timeout=15, deadline=30).json()
+        _extract_repositories(dev_data, repos)
     except requests.exceptions.RequestException as e:
         log_list.append(f"[WARNING] JIRA Dev Panel API Error: {e}")
+        return repos  # Failed lookups are not cached
+
+    updated = issue.get("fields", {}).get("updated")
+    if updated:
+        with _DEV_PANEL_CACHE_LOCK:
+            _DEV_PANEL_CACHE[issue["id"]] = (updated, frozenset(repos))
+    return repos
 
 
 def _extract_repositories(dev_data, dev_branches):
@@ -355,29 +744,88 @@ def _extract_repositories(dev_data, dev_branches):
             dev_branches.add(repo_name)
 
 
-def _calculate_times(changelog):
-    in_progress_date, done_date = None, None
-    for entry in changelog:
-        for item in entry["items"]:
-            if item["field"] == "status":
-                in_progress_date, done_date = _update_status_dates(item, entry, in_progress_date, done_date)
-    return in_progress_date, done_date
-
+# --- Async fetch pipeline ---
+# Overlaps all Jira I/O of a fetch on one event loop: search pages (through the issue
+# store), the developer accountId lookup, and the dev-panel lookups, which start as each
+# page arrives instead of after the last one. Blocking calls run on a thread pool over
+# the shared Jira client and a semaphore bounds the calls in flight. Dev-panel results
+# land in the dev-panel cache, so the processing stage afterwards makes no requests.
+_PAGES_DONE = object()
+
+
+async def _run_issue_pipeline(url, headers, params, log_list, sprint_id=None, developer_name=None, max_concurrency=PIPELINE_MAX_CONCURRENCY):
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(max_concurrency)
+    client = get_jira_client()
+    pages = _iter_synced_issue_pages(url, headers, params, log_list)
+    # next() runs on an executor thread; closing the generator mid-next() would raise
+    # "generator already executing" and mask the original error, so both take this lock
+    pages_lock = Lock()
+
+    def next_page():
+        with pages_lock:
+            return next(pages, _PAGES_DONE)
+
+    # One extra worker for the page iterator, which runs outside the semaphore
+    with ThreadPoolExecutor(max_workers=max_concurrency + 1) as executor:
+        async def call(fn, *args):
+            async with semaphore:
+                return await loop.run_in_executor(executor, fn, *args)
+
+        tasks = []
+        account_task = None
+        if developer_name:
+            account_task = asyncio.create_task(call(get_account_id, developer_name, JIRA_URL, headers, log_list))
+            tasks.append(account_task)
+
+        issues = []
+        try:
+            while True:
+                page = await loop.run_in_executor(executor, next_page)
+                if page is _PAGES_DONE:
+                    break
+                issues.extend(page)
+                in_sprint_keys = SprintIndex(page).issue_keys(sprint_id) if sprint_id else None
+                for issue in page:
+                    if in_sprint_keys is not None and issue.get("key") not in in_sprint_keys:
+                        continue
+                    if _get_cached_dev_panel(issue) is None:
+                        tasks.append(asyncio.create_task(call(_fetch_dev_panel_repositories, issue, headers, log_list, client)))
+            log_debug(log_list, "JIRA Pipeline: %s issues fetched, %s dev-panel/user lookups in flight", len(issues), len(tasks))
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+        finally:
+            with pages_lock:  # Waits for an in-flight next() to return first
+                pages.close()
+
+    return issues, account_task.result() if account_task else None
+
+
+def run_issue_pipeline(url, headers, params, log_list, sprint_id=None, developer_name=None, max_concurrency=PIPELINE_MAX_CONCURRENCY):
+    """
+    Sync wrapper for the async fetch pipeline (Streamlit scripts have no running loop).
+    Returns (issues, developer accountId or None). Raises requests.exceptions.RequestException.
+    """
+    pipeline = _run_issue_pipeline(url, headers, params, log_list, sprint_id, developer_name, max_concurrency)
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(pipeline)
+    # Called from inside an event loop: run the pipeline on its own loop in a helper thread
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, pipeline).result()
 
-def _update_status_dates(item, entry, in_progress_date, done_date):
-    to_status = item["toString"].lower()
-    if to_status == "in progress" and not in_progress_date:
-        in_progress_date = entry["created"]
-    elif to_status in ["qa complete", "done", "released", "closed"] and not done_date:
-        done_date = entry["created"]
-    return in_progress_date, done_date
 
-def _update_closure_metrics(issue, metrics):
+def _update_closure_metrics(issue, metrics, points=0.0):
     fields = issue.get("fields", {})
     status = fields.get("status", {}).get("name", "").lower()
     issue_type = fields.get("issuetype", {}).get("name", "").lower()
 
     if status in ["qa complete", "done", "released", "closed"]:
+        metrics["story_points_closed"] += points
         if issue_type == "bug":
             metrics["bugs_closed"] += 1
         else:
@@ -386,23 +834,27 @@ def _update_closure_metrics(issue, metrics):
 
 def _update_time_metrics(issue, metrics, in_progress_date, done_date):
     if in_progress_date and done_date:
-        metrics["cycle_times"].append((parser.isoparse(done_date) - parser.isoparse(in_progress_date)).days)
+        metrics["cycle_times"].append((parse_jira_timestamp(done_date) - parse_jira_timestamp(in_progress_date)).days)
     if issue.get("fields", {}).get("created") and done_date:
-        metrics["lead_times"].append((parser.isoparse(done_date) - parser.isoparse(issue["fields"]["created"])).days)
+        metrics["lead_times"].append((parse_jira_timestamp(done_date) - parse_jira_timestamp(issue["fields"]["created"])).days)
 
 
-def initialize_metrics():
+# 'status_engine' is a TimeInStatusEngine scope that also receives the status intervals
+# (e.g. to build reports across sprints); each metrics set gets a fresh one by default.
+def initialize_metrics(status_engine=None):
     return {
-        "story_points": 0, "tickets_closed": 0, "bugs_closed": 0, 
+        "story_points": 0, "story_points_closed": 0, "tickets_closed": 0, "bugs_closed": 0, 
         # "comments_count": [],
-        "lead_times": [], "cycle_times": [], "dev_branches": set(), "failed_qa_count": 0, "logged_time": 0
+        "lead_times": [], "cycle_times": [], "dev_branches": set(), "failed_qa_count": 0, "logged_time": 0,
+        "time_in_status": {}, "status_engine": status_engine or TimeInStatusEngine().scope()
     }
 
 
-def summarize_metrics(metrics, issues):
+def summarize_metrics(metrics, issues, log_list=None):
     result = {
         "all_issues_count": len(issues),
         "story_points_done": metrics["story_points"],
+        "story_points_closed": metrics["story_points_closed"],
         "tickets_closed": metrics["tickets_closed"],
         "bugs_closed": metrics["bugs_closed"],
         # "avg_comments": round(statistics.mean(metrics["comments_count"]), 2) if metrics["comments_count"] else 0,
@@ -411,15 +863,58 @@ def summarize_metrics(metrics, issues):
         "dev_branches": list(metrics["dev_branches"]),
         "failed_qa_count": metrics["failed_qa_count"],
         "logged_time": metrics["logged_time"],
+        "time_in_status": metrics["time_in_status"],
+        "time_in_status_percentiles": metrics["status_engine"].report(),
     }
-    # Debug final story points
-    print(f"[DEBUG] Final story points calculation: {metrics['story_points']} from {len(issues)} issues")
+    result.update(percentile_summary("lead_time", pd.Series(metrics["lead_times"], dtype="float64")))
+    result.update(percentile_summary("cycle_time", pd.Series(metrics["cycle_times"], dtype="float64")))
+    if log_list is not None:
+        log_debug(log_list, "Final story points calculation: %s from %s issues", metrics["story_points"], len(issues))
     return result
 
 
+# --- Loads the developer -> accountId index once so later lookups are local ---
+def warm_developer_index(jira_email, jira_token, developer_names, log_list):
+    if not jira_email or not jira_token:
+        log_list.append("[ERROR] JIRA: Credentials (email/token) not provided for identity index.")
+        return {}
+    auth_string = f"{jira_email}:{jira_token}".encode("utf-8")
+    encoded_auth = base64.b64encode(auth_string).decode("utf-8")
+    headers = {
+        "Authorization": f"Basic {encoded_auth}",
+        "Accept": "application/json"
+    }
+    return load_user_index(JIRA_URL, headers, log_list, developer_names)
+
+
+# --- Loads the Tempo worklogs of a team for a date range (one paged bulk pull) ---
+# Returns a WorklogIndex to pass as 'worklogs' to the fetch functions, or None
+# (no Tempo token / Tempo unavailable) to keep changelog-based logged time.
+def fetch_team_worklogs(jira_email, jira_token, tempo_token, developer_names, date_from, date_to, log_list):
+    if not jira_email or not jira_token:
+        log_list.append("[ERROR] JIRA: Credentials (email/token) not provided for worklog authors.")
+        return None
+    auth_string = f"{jira_email}:{jira_token}".encode("utf-8")
+    encoded_auth = base64.b64encode(auth_string).decode("utf-8")
+    headers = {
+        "Authorization": f"Basic {encoded_auth}",
+        "Accept": "application/json"
+    }
+    account_ids = []
+    for developer_name in developer_names:
+        account_id = get_account_id(developer_name, JIRA_URL, headers, log_list)
+        if account_id:
+            account_ids.append(account_id)
+    if not account_ids:
+        log_list.append("[WARNING] Tempo: None of the developers resolved to Jira accounts - using changelog logged time.")
+        return None
+    return fetch_tempo_worklogs(tempo_token, date_from, date_to, log_list, author_ids=account_ids)
+
+
 # --- Function to fetch JIRA metrics for an Individual Developer ---
 # MODIFIED: Added 'headers' variable creation and passing to _process_jira_issues
-def fetch_jira_metrics_via_api(jira_email, jira_token, developer_name, sprint_id, team_name, log_list):
+# 'worklogs' (see fetch_team_worklogs) switches logged time to Tempo worklogs.
+def fetch_jira_metrics_via_api(jira_email, jira_token, developer_name, sprint_id, team_name, log_list, worklogs=None):
     log_list.append(f"[INFO] JIRA: Starting fetch for individual developer '{developer_name}' in sprint '{sprint_id}' for team name '{team_name}'...")
     
     if not jira_email or not jira_token:
@@ -445,63 +940,48 @@ def fetch_jira_metrics_via_api(jira_email, jira_token, developer_name, sprint_id
 
     
     jql = " AND ".join(jql_parts)
-    url = f"{JIRA_URL}/rest/api/3/search"
+    url = JIRA_SEARCH_URL
 
     params = {
         "jql": jql,
-        "maxResults": 100, 
-        "fields": "summary,issuetype,assignee,created,comment,customfield_10014,status,customfield_10000,customfield_10001,customfield_10010", 
+        "maxResults": SEARCH_PAGE_SIZE, 
+        "fields": SEARCH_FIELDS, 
         "expand": "changelog" 
     }
 
     try:
         log_list.append(f"[INFO] JIRA individual API: GET {url}")
-        log_list.append(f"[DEBUG] JIRA Individual JQL: {jql}")
-        log_list.append(f"[DEBUG] JIRA Individual Params: {params}")
-        response = requests.get(url, headers=headers, params=params)
-        response.raise_for_status() 
-        log_list.append(f"[INFO] JIRA API: GET {url} - Status: {response.status_code}")
+        log_debug(log_list, "JIRA Individual JQL: %s", jql)
+        log_debug(log_list, "JIRA Individual Params: %s", params)
+        # Search pages, dev-panel lookups and the accountId lookup overlap in one pipeline
+        issues, developer_account_id = run_issue_pipeline(url, headers, params, log_list, sprint_id, developer_name)
+        log_list.append(f"[INFO] JIRA API: GET {url} - all pages received")
     except requests.exceptions.RequestException as e:
         log_list.append(f"[ERROR] JIRA API Request Error: {e}")
         return {"error": f"JIRA API failed: {e}"}
 
-    issues = response.json().get("issues", [])
     log_list.append(f"[INFO] Fetched {len(issues)} issues for individual developer '{developer_name}' in sprint '{sprint_id}'.")
-    log_list.append(f"[DEBUG] Individual Issues: {[issue.get('key') for issue in issues[:5]]}...")  # Show first 5 issue keys
+    log_debug(log_list, "Individual Issues: %s...", [issue.get('key') for issue in issues[:5]])  # Show first 5 issue keys
     if not issues:
         log_list.append("[WARNING] JIRA: No issues found for the specified individual developer/team/sprint combination.")
         return {"error": "No issues found for individual developer/team/sprint.", "dev_branches": []}
 
-    # get developer account ID
-    url = f"{JIRA_URL}/rest/api/3/user/search?query={developer_name.lower()}"
-    developer_account_id = None
-    try:
-        account_response = requests.get(url, headers=headers)
-        account_response.raise_for_status() 
-        users = account_response.json()
-        for user in users:
-            developer_account_id = user.get("accountId")
-            if developer_account_id:
-                break
-
-        if not developer_account_id:
-            log_list.append(f"[WARNING] JIRA: Developer '{developer_name}' not found in JIRA.")
-            return {"error": f"Developer '{developer_name}' not found in JIRA.", "dev_branches": []}
-    
-        # log_list.append(f"[INFO] JIRA API: GET {url} - Status: {response.status_code} - Account Id: {developer_account_id}")
-    except requests.exceptions.RequestException as e:
-        log_list.append(f"[ERROR] JIRA API Request Error: {e}")
-        return {"error": f"JIRA API failed: {e}"}
+    if not developer_account_id:
+        log_list.append(f"[WARNING] JIRA: Developer '{developer_name}' not found in JIRA.")
+        return {"error": f"Developer '{developer_name}' not found in JIRA.", "dev_branches": []}
 
     # print(f"developer_account_id 222 = {developer_account_id}...")  # Debugging line
 
-    # MODIFIED: Pass 'headers' to _process_jira_issues
-    return _process_jira_issues(issues, sprint_id, log_list, headers, developer_account_id)
+    # Dev panels were looked up by the pipeline, so this stage is served from the cache
+    return _process_jira_issues(issues, sprint_id, log_list, headers, developer_account_id, worklogs=worklogs)
 
 
 # --- New: Function to fetch JIRA metrics for a Team ---
 # MODIFIED: Added 'headers' variable creation and passing to _process_jira_issues
-def fetch_jira_metrics_for_team(jira_email, jira_token, team_id, team_name, sprint_id, log_list):
+# The result also carries per-developer metrics for every assignee under "members"
+# (keyed by accountId); 'developer_names' (e.g. the team's teams.txt entries) name them,
+# and get_member_metrics looks one up by that name.
+def fetch_jira_metrics_for_team(jira_email, jira_token, team_id, team_name, sprint_id, log_list, developer_names=None, worklogs=None):
     log_list.append(f"[INFO] JIRA: Starting fetch for TEAM '{team_name}' (ID: {team_id}) in sprint '{sprint_id}'...")
     
     if not jira_email or not jira_token:
@@ -534,32 +1014,142 @@ def fetch_jira_metrics_for_team(jira_email, jira_token, team_id, team_name, spri
             jql_parts.append(f'sprint = "{team_name} {sprint_id}"')
 
     jql = " AND ".join(jql_parts)
-    url = f"{JIRA_URL}/rest/api/3/search"
+    url = JIRA_SEARCH_URL
 
     params = {
         "jql": jql,
-        "maxResults": 100, 
-        "fields": "summary,issuetype,assignee,created,comment,customfield_10014,status,customfield_10000,customfield_10001,customfield_10010", 
+        "maxResults": SEARCH_PAGE_SIZE, 
+        "fields": SEARCH_FIELDS, 
         "expand": "changelog" 
     }
 
     try:
         log_list.append(f"[INFO] JIRA Team API: GET {url}")
-        log_list.append(f"[DEBUG] JIRA Team JQL: {jql}")
-        log_list.append(f"[DEBUG] JIRA Team Params: {params}")
-        response = requests.get(url, headers=headers, params=params)
-        response.raise_for_status() 
-        log_list.append(f"[INFO] JIRA Team API: Status: {response.status_code}")
+        log_debug(log_list, "JIRA Team JQL: %s", jql)
+        log_debug(log_list, "JIRA Team Params: %s", params)
+        issues, _ = run_issue_pipeline(url, headers, params, log_list, sprint_id)
+        log_list.append(f"[INFO] JIRA Team API: all pages received")
     except requests.exceptions.RequestException as e:
         log_list.append(f"[ERROR] JIRA Team API Request Error: {e}")
         return {"error": f"JIRA Team API failed: {e}"}
 
-    issues = response.json().get("issues", [])
     log_list.append(f"[INFO] Fetched {len(issues)} issues for team '{team_name}' in sprint '{sprint_id}'.")
-    log_list.append(f"[DEBUG] Team Issues: {[issue.get('key') for issue in issues[:5]]}...")  # Show first 5 issue keys
+    log_debug(log_list, "Team Issues: %s...", [issue.get('key') for issue in issues[:5]])  # Show first 5 issue keys
     if not issues:
         log_list.append("[WARNING] JIRA Team: No issues found for the specified team/sprint combination.")
         return {"error": "No issues found for team/sprint.", "dev_branches": []}
 
-    # MODIFIED: Pass 'headers' to _process_jira_issues
-    return _process_jira_issues(issues, sprint_id, log_list, headers)
\ No newline at end of file
+    member_names = {}
+    for developer_name in developer_names or []:
+        account_id = get_account_id(developer_name, JIRA_URL, headers, log_list)
+        if account_id:
+            member_names[account_id] = developer_name
+
+    # Dev panels were looked up by the pipeline, so this stage is served from the cache
+    result = _process_team_issues(issues, sprint_id, log_list, headers, member_names, worklogs=worklogs)
+    result["member_account_ids"] = {name: account_id for account_id, name in member_names.items()}
+    return result
+
+
+# A developer's metrics from a fetch_jira_metrics_for_team result, or None when the
+# developer wasn't among its 'developer_names' or has no issues in the team's query.
+def get_member_metrics(team_result, developer_name):
+    account_id = team_result.get("member_account_ids", {}).get(developer_name)
+    return team_result.get("members", {}).get(account_id) if account_id else None
+
+
+def _fetch_sprint_history_issues(headers, jql_parts, sprint_ids, team_name, scope, log_list):
+    """
+    Issues of several sprints from one 'sprint in (...)' search. Jira rejects that whole
+    query (400) when any sprint doesn't exist, so it then falls back to one search per
+    sprint, skipping the missing ones. Raises requests.exceptions.RequestException.
+    """
+    def search(sprint_clause):
+        params = {
+            "jql": " AND ".join(jql_parts + [sprint_clause]),
+            "maxResults": SEARCH_PAGE_SIZE,
+            "fields": SEARCH_FIELDS,
+            "expand": "changelog"
+        }
+        log_debug(log_list, "JIRA Sprint History JQL (%s): %s", scope, params["jql"])
+        return list(chain.from_iterable(_iter_synced_issue_pages(JIRA_SEARCH_URL, headers, params, log_list)))
+
+    sprint_names = ", ".join(f'"{team_name} {sprint_id}"' for sprint_id in sprint_ids)
+    try:
+        return search(f"sprint in ({sprint_names})")
+    except requests.exceptions.HTTPError as e:
+        if e.response is None or e.response.status_code != 400 or len(sprint_ids) < 2:
+            raise
+    log_list.append(f"[WARNING] JIRA: Sprint history query rejected - querying the {len(sprint_ids)} sprints one by one.")
+
+    issues = {}
+    for sprint_id in sprint_ids:
+        try:
+            sprint_issues = search(f'sprint = "{team_name} {sprint_id}"')
+        except requests.exceptions.HTTPError as e:
+            if e.response is None or e.response.status_code != 400:
+                raise
+            log_list.append(f"[WARNING] JIRA: Sprint '{team_name} {sprint_id}' does not exist - skipping it.")
+            continue
+        for issue in sprint_issues:
+            issues.setdefault(issue.get("key"), issue)  # Issues carried over appear in several sprints
+    return list(issues.values())
+
+
+# --- Sprint history: per-sprint metrics for a window of sprints from one query ---
+# One 'sprint in (...)' search per scope (developer, and team when team_id is given)
+# instead of one fetch per sprint. Dev-panel lookups are skipped; the trend views
+# don't use repositories.
+# Returns {sprint_id: {"individual": metrics, "team": metrics or None}} or {"error": ...}.
+# 'status_engine' (a TimeInStatusEngine, e.g. shared across teams for an org-wide YTD
+# report) receives the team's status intervals - the developer's without team_id -
+# under (team_name, sprint_id).
+def fetch_jira_metrics_for_sprints(jira_email, jira_token, developer_name, sprint_ids, team_name, log_list, team_id=None, status_engine=None):
+    sprint_ids = list(dict.fromkeys(sprint_ids))
+    log_list.append(f"[INFO] JIRA: Starting sprint history fetch for '{developer_name}' over {len(sprint_ids)} sprints of team '{team_name}'...")
+
+    if not jira_email or not jira_token:
+        log_list.append("[ERROR] JIRA: Credentials (email/token) not provided for sprint history.")
+        return {"error": "JIRA credentials not provided."}
+    if not sprint_ids:
+        return {}
+
+    auth_string = f"{jira_email}:{jira_token}".encode("utf-8")
+    encoded_auth = base64.b64encode(auth_string).decode("utf-8")
+    headers = {
+        "Authorization": f"Basic {encoded_auth}",
+        "Accept": "application/json"
+    }
+
+    scopes = {"individual": [f'assignee="{developer_name}"']}
+    if team_id:
+        scopes["team"] = [f"'Team[Team]' = \"{team_id}\"", "issuetype NOT IN (Sub-task, Epic)"]
+
+    developer_account_id = None
+    history = {sprint_id: {"individual": None, "team": None} for sprint_id in sprint_ids}
+    for scope, jql_parts in scopes.items():
+        try:
+            issues = _fetch_sprint_history_issues(headers, jql_parts, sprint_ids, team_name, scope, log_list)
+        except requests.exceptions.RequestException as e:
+            log_list.append(f"[ERROR] JIRA Sprint History API Request Error: {e}")
+            return {"error": f"JIRA API failed: {e}"}
+        log_list.append(f"[INFO] JIRA: Fetched {len(issues)} {scope} issues across {len(sprint_ids)} sprints.")
+
+        if scope == "individual" and issues:
+            developer_account_id = get_account_id(developer_name, JIRA_URL, headers, log_list)
+            if not developer_account_id:
+                log_list.append(f"[WARNING] JIRA: Developer '{developer_name}' not found in JIRA.")
+                return {"error": f"Developer '{developer_name}' not found in JIRA."}
+
+        records_status = status_engine is not None and scope == ("team" if team_id else "individual")
+        for sprint_id, sprint_issues in _split_issues_by_sprint(issues, sprint_ids, team_name).items():
+            sprint_status = status_engine.scope(team_name, sprint_id) if records_status else None
+            if scope == "individual":
+                history[sprint_id][scope] = _process_jira_issues(
+                    sprint_issues, None, log_list, headers, developer_account_id, with_dev_panels=False, status_engine=sprint_status
+                )
+            else:
+                history[sprint_id][scope] = _process_team_issues(
+                    sprint_issues, None, log_list, headers, with_dev_panels=False, status_engine=sprint_status
+                )
+    return history
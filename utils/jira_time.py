@@ -0,0 +1,34 @@
+from datetime import datetime
+from functools import lru_cache
+
+import pandas as pd
+from dateutil import parser
+
+# Jira Cloud sends every timestamp in this one fixed format, e.g. 2025-07-24T01:57:01.438-0400
+JIRA_TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S.%f%z"
+
+
+@lru_cache(maxsize=65536)
+def parse_jira_timestamp(value):
+    """
+    Parses a Jira timestamp into an aware datetime. Memoized, since the same 'created'
+    strings repeat across issues and histories. Tries the C-level ISO parser first
+    (Python 3.11+ accepts Jira's '+0000' offsets), then the fixed Jira format, then
+    dateutil for anything unusual. Raises ValueError/TypeError like dateutil.
+    """
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        pass
+    try:
+        return datetime.strptime(value, JIRA_TIMESTAMP_FORMAT)
+    except ValueError:
+        return parser.isoparse(value)
+
+
+def parse_jira_timestamps(values):
+    """Bulk mode for the columnar pipeline: parses a column of Jira timestamps to UTC (NaT for missing)."""
+    try:
+        return pd.to_datetime(values, utc=True, format=JIRA_TIMESTAMP_FORMAT)
+    except (TypeError, ValueError):
+        return pd.to_datetime(values, utc=True, format="ISO8601")
@@ -0,0 +1,36 @@
+import json
+import os
+import time
+
+# Local caches live next to the app unless PRODUCTIVITY_CACHE_DIR points elsewhere
+CACHE_DIR = os.environ.get(
+    "PRODUCTIVITY_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache"),
+)
+
+
+def get_cache_path(filename):
+    """Returns the path for a cache file, creating the cache directory if needed."""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    return os.path.join(CACHE_DIR, filename)
+
+
+def load_json_snapshot(filename, max_age_seconds):
+    """Returns the data saved under 'filename', or None if missing, unreadable or older than max_age_seconds."""
+    try:
+        with open(get_cache_path(filename), "r", encoding="utf-8") as file:
+            snapshot = json.load(file)
+    except (OSError, ValueError):
+        return None
+    if time.time() - snapshot.get("saved_at", 0) > max_age_seconds:
+        return None
+    return snapshot.get("data")
+
+
+def save_json_snapshot(filename, data):
+    """Atomically writes 'data' with the current time so readers can apply a TTL."""
+    path = get_cache_path(filename)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        json.dump({"saved_at": time.time(), "data": data}, file, separators=(",", ":"))
+    os.replace(tmp_path, path)
@@ -0,0 +1,99 @@
+import re
+import time
+from collections import deque
+from threading import Lock
+
+LEVELS = {"DEBUG": 10, "INFO": 20, "WARN": 30, "WARNING": 30, "ERROR": 40, "CRITICAL": 50}
+_LEVEL_PATTERN = re.compile(r"\[(DEBUG|INFO|WARN|WARNING|ERROR|CRITICAL)\]", re.IGNORECASE)
+
+
+class LogBuffer:
+    """
+    Thread-safe, level-filtered log sink that can be passed anywhere a log_list is expected.
+    Records below 'level' are dropped on arrival, messages logged through debug()/info()/...
+    are only %-formatted when read, and at most 'max_records' recent records are kept.
+    append() accepts the existing "[LEVEL] message" strings.
+    """
+
+    def __init__(self, level="INFO", max_records=2000):
+        self.level = _level_number(level)
+        self._records = deque(maxlen=max_records)
+        self._lock = Lock()
+
+    def is_enabled_for(self, level):
+        return _level_number(level) >= self.level
+
+    def log(self, level, message, *args):
+        level_no = _level_number(level)
+        if level_no < self.level:
+            return
+        with self._lock:
+            self._records.append((time.time(), level.upper(), None, message, args))
+
+    def debug(self, message, *args):
+        self.log("DEBUG", message, *args)
+
+    def info(self, message, *args):
+        self.log("INFO", message, *args)
+
+    def warning(self, message, *args):
+        self.log("WARNING", message, *args)
+
+    def error(self, message, *args):
+        self.log("ERROR", message, *args)
+
+    def append(self, text):
+        """list.append compatibility: the level is read from the first "[LEVEL]" tag (INFO if none)."""
+        match = _LEVEL_PATTERN.search(text, 0, 64)
+        level = match.group(1).upper() if match else "INFO"
+        if LEVELS[level] < self.level:
+            return
+        with self._lock:
+            self._records.append((time.time(), level, text, None, None))
+
+    def records(self):
+        """Snapshot of (timestamp, level, formatted message) tuples."""
+        with self._lock:
+            records = list(self._records)
+        return [(created, level, _render(level, raw, message, args)) for created, level, raw, message, args in records]
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
+
+    def __iter__(self):
+        return iter([text for _, _, text in self.records()])
+
+    def __len__(self):
+        with self._lock:
+            return len(self._records)
+
+    def __bool__(self):
+        return len(self) > 0
+
+
+def _level_number(level):
+    """Numeric level for a level name; unknown names (e.g. a mistyped PRODUCTIVITY_LOG_LEVEL) mean INFO."""
+    return LEVELS.get(str(level).upper(), LEVELS["INFO"])
+
+
+def _render(level, raw, message, args):
+    if raw is not None:
+        return raw
+    if args:
+        try:
+            message = message % args
+        except (TypeError, ValueError):
+            message = f"{message} {args}"
+    return f"[{level}] {message}"
+
+
+def log_debug(log_list, message, *args):
+    """
+    Lazy DEBUG logging for hot loops: a LogBuffer formats only if DEBUG is enabled and
+    the record is read; a plain list gets the formatted "[DEBUG] ..." string as before.
+    """
+    if isinstance(log_list, LogBuffer):
+        log_list.debug(message, *args)
+    else:
+        log_list.append(f"[DEBUG] {message % args if args else message}")
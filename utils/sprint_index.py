@@ -0,0 +1,56 @@
+JQL_SPRINT_FUNCTIONS = ("openSprints()", "startOfYear()")
+
+
+class SprintIndex:
+    """
+    Issue keys by sprint id and by lowercased sprint name (customfield_10010), built in
+    one pass over a fetch. A sprint query matches an issue when it equals one of the
+    issue's sprint ids or is a case-insensitive substring of one of its sprint names,
+    like the original per-issue filter; the substring test runs once per distinct
+    name instead of once per issue and sprint, and results are cached per query.
+    """
+
+    def __init__(self, issues=()):
+        self._by_id = {}
+        self._by_name = {}
+        self._all_keys = set()
+        self._matches = {}
+        for issue in issues:
+            self.add(issue)
+
+    def add(self, issue):
+        key = issue.get("key")
+        self._all_keys.add(key)
+        self._matches.clear()
+        issue_sprints = issue.get("fields", {}).get("customfield_10010") or []
+        if isinstance(issue_sprints, str):
+            self._by_name.setdefault(issue_sprints.lower(), set()).add(key)
+            return
+        if not isinstance(issue_sprints, list):
+            return
+        for sprint in issue_sprints:
+            if not isinstance(sprint, dict):
+                continue
+            self._by_name.setdefault(str(sprint.get("name", "")).lower(), set()).add(key)
+            self._by_id.setdefault(str(sprint.get("id", "")), set()).add(key)
+
+    def issue_keys(self, sprint_id):
+        """Keys of the issues in 'sprint_id' (every issue for the JQL sprint functions)."""
+        if sprint_id in JQL_SPRINT_FUNCTIONS:
+            return self._all_keys
+        matches = self._matches.get(sprint_id)
+        if matches is None:
+            needle = sprint_id.lower()
+            matches = set(self._by_id.get(sprint_id, ()))
+            for name, keys in self._by_name.items():
+                if needle in name:
+                    matches |= keys
+            self._matches[sprint_id] = matches
+        return matches
+
+    def exact_name_keys(self, sprint_name):
+        """Keys of the issues in the sprint named exactly 'sprint_name' (case-insensitive)."""
+        return self._by_name.get(sprint_name.lower(), set())
+
+    def contains(self, issue, sprint_id):
+        return issue.get("key") in self.issue_keys(sprint_id)
@@ -0,0 +1,107 @@
+import time
+from threading import Lock
+
+import requests
+
+from utils.jira_client import get_jira_client
+from utils.log_buffer import log_debug
+
+TEMPO_API_URL = "https://api.tempo.io/4"
+TEMPO_PAGE_SIZE = 5000  # Tempo's maximum 'limit'
+WORKLOG_CACHE_TTL_SECONDS = 15 * 60
+
+# (author ids, from, to) -> (fetched_at, WorklogIndex), so reruns within a session stay local
+_worklog_cache = {}
+_worklog_cache_lock = Lock()
+
+
+class WorklogIndex:
+    """
+    Tempo worklogs indexed by author accountId and Jira issue id, so logged time for any
+    developer, issue set or date range is a local lookup.
+    """
+
+    def __init__(self, worklogs=()):
+        self.by_author = {}  # accountId -> {issue id: [(start date, seconds), ...]}
+        self.count = 0
+        for worklog in worklogs:
+            self.add(worklog)
+
+    def add(self, worklog):
+        author_id = (worklog.get("author") or {}).get("accountId")
+        issue_id = (worklog.get("issue") or {}).get("id")
+        if not author_id or issue_id is None:
+            return
+        entry = (worklog.get("startDate"), int(worklog.get("timeSpentSeconds") or 0))
+        self.by_author.setdefault(author_id, {}).setdefault(str(issue_id), []).append(entry)
+        self.count += 1
+
+    def logged_time(self, author_id=None, issue_ids=None, date_from=None, date_to=None):
+        """
+        Seconds logged by 'author_id' (None: everyone) on 'issue_ids' (None: any issue)
+        between the optional ISO dates 'date_from' and 'date_to' (inclusive).
+        """
+        authors = [self.by_author.get(author_id, {})] if author_id else self.by_author.values()
+        wanted = {str(issue_id) for issue_id in issue_ids} if issue_ids is not None else None
+        total = 0
+        for issues in authors:
+            for issue_id in (wanted & issues.keys() if wanted is not None else issues.keys()):
+                for start_date, seconds in issues[issue_id]:
+                    if date_from and start_date and start_date < date_from:
+                        continue
+                    if date_to and start_date and start_date > date_to:
+                        continue
+                    total += seconds
+        return total
+
+    def logged_time_by_author(self, issue_ids=None, date_from=None, date_to=None):
+        return {
+            author_id: self.logged_time(author_id, issue_ids, date_from, date_to)
+            for author_id in self.by_author
+        }
+
+
+def fetch_tempo_worklogs(tempo_token, date_from, date_to, log_list, author_ids=None):
+    """
+    Pulls every worklog between the ISO dates 'date_from' and 'date_to' (optionally only for
+    'author_ids', e.g. a team) through Tempo's paged bulk search and returns a WorklogIndex,
+    or None when Tempo is unavailable (callers then fall back to changelog logged time).
+    """
+    if not tempo_token:
+        log_list.append("[WARNING] Tempo: No API token configured - using changelog logged time.")
+        return None
+
+    cache_key = (tuple(sorted(author_ids)) if author_ids else None, str(date_from), str(date_to))
+    with _worklog_cache_lock:
+        cached = _worklog_cache.get(cache_key)
+    if cached and time.time() - cached[0] < WORKLOG_CACHE_TTL_SECONDS:
+        log_list.append(f"[INFO] Tempo: Using {cached[1].count} cached worklogs for {date_from} to {date_to}.")
+        return cached[1]
+
+    headers = {"Authorization": f"Bearer {tempo_token}", "Accept": "application/json"}
+    body = {"from": str(date_from), "to": str(date_to)}
+    if author_ids:
+        body["authorIds"] = list(author_ids)
+
+    index = WorklogIndex()
+    client = get_jira_client()
+    url = f"{TEMPO_API_URL}/worklogs/search"
+    params = {"offset": 0, "limit": TEMPO_PAGE_SIZE}
+    try:
+        while True:
+            data = client.post(url, headers=headers, params=params, json=body).json()
+            results = data.get("results", [])
+            for worklog in results:
+                index.add(worklog)
+            log_debug(log_list, "Tempo: %s worklogs at offset %s", len(results), params["offset"])
+            if not results or not (data.get("metadata") or {}).get("next"):
+                break
+            params = dict(params, offset=params["offset"] + len(results))
+    except requests.exceptions.RequestException as e:
+        log_list.append(f"[ERROR] Tempo: Failed to fetch worklogs: {e}")
+        return None
+
+    log_list.append(f"[INFO] Tempo: Indexed {index.count} worklogs for {date_from} to {date_to}.")
+    with _worklog_cache_lock:
+        _worklog_cache[cache_key] = (time.time(), index)
+    return index
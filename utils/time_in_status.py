@@ -0,0 +1,207 @@
+import math
+
+import numpy as np
+
+PERCENTILES = (50, 85, 95)
+RELATIVE_ACCURACY = 0.01
+MAX_BUCKETS = 2048
+
+
+class QuantileSketch:
+    """
+    Streaming quantile sketch with log-spaced buckets (DDSketch-style): any quantile is
+    returned within 'relative_accuracy' of the true value, memory is bounded by
+    'max_buckets' whatever the number of values, and sketches merge losslessly.
+    Values <= 0 are counted as zero.
+    """
+
+    def __init__(self, relative_accuracy=RELATIVE_ACCURACY, max_buckets=MAX_BUCKETS):
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.buckets = {}
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, value, count=1):
+        if value > 0:
+            index = math.ceil(math.log(value) / self._log_gamma)
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        else:
+            self.zero_count += count
+        self._track(value, value, value * count, count)
+
+    def add_many(self, values):
+        """Vectorized add for an array-like of values."""
+        values = np.asarray(values, dtype="float64")
+        if not values.size:
+            return
+        positive = values[values > 0]
+        self.zero_count += int(values.size - positive.size)
+        if positive.size:
+            indexes, counts = np.unique(np.ceil(np.log(positive) / self._log_gamma).astype("int64"), return_counts=True)
+            for index, count in zip(indexes.tolist(), counts.tolist()):
+                self.buckets[index] = self.buckets.get(index, 0) + count
+        self._track(float(values.min()), float(values.max()), float(values.sum()), int(values.size))
+
+    def merge(self, other):
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Only sketches with the same relative accuracy can be merged.")
+        if not other.count:
+            return self
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self._track(other.min, other.max, other.total, other.count)
+        return self
+
+    def quantile(self, q):
+        """Estimated q-quantile (0 <= q <= 1), None when empty."""
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        if rank < self.zero_count:
+            return 0.0
+        seen = self.zero_count
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen > rank:
+                estimate = 2 * self._gamma ** index / (self._gamma + 1)
+                return float(min(max(estimate, self.min), self.max))
+        return float(self.max)
+
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    def to_dict(self):
+        return {
+            "relative_accuracy": self.relative_accuracy, "max_buckets": self.max_buckets,
+            "buckets": [[index, count] for index, count in self.buckets.items()],
+            "zero_count": self.zero_count, "count": self.count, "total": self.total,
+            "min": self.min, "max": self.max,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data["relative_accuracy"], data["max_buckets"])
+        sketch.buckets = {int(index): count for index, count in data["buckets"]}
+        sketch.zero_count = data["zero_count"]
+        sketch.count = data["count"]
+        sketch.total = data["total"]
+        sketch.min = data["min"]
+        sketch.max = data["max"]
+        return sketch
+
+    def _track(self, low, high, total, count):
+        self.count += count
+        self.total += total
+        self.min = low if self.min is None else min(self.min, low)
+        self.max = high if self.max is None else max(self.max, high)
+        if len(self.buckets) > self.max_buckets:
+            self._collapse()
+
+    def _collapse(self):
+        # Fold the lowest buckets together; only the smallest quantiles lose accuracy
+        indexes = sorted(self.buckets)
+        excess = len(indexes) - self.max_buckets
+        folded = sum(self.buckets.pop(index) for index in indexes[:excess + 1])
+        self.buckets[indexes[excess]] = folded
+
+
+class TimeInStatusEngine:
+    """
+    Time-in-status percentiles from status intervals (seconds per stay in a status).
+    Keeps one QuantileSketch per (status, team, sprint), so org-wide reports over any
+    number of issues and sprints fit in constant memory; reports merge the sketches
+    matching the requested team/sprint (None matches all).
+    """
+
+    def __init__(self, relative_accuracy=RELATIVE_ACCURACY):
+        self.relative_accuracy = relative_accuracy
+        self._sketches = {}
+
+    def add(self, status, seconds, team=None, sprint=None):
+        self._sketch(status, team, sprint).add(seconds)
+
+    def add_many(self, status, seconds, team=None, sprint=None):
+        self._sketch(status, team, sprint).add_many(seconds)
+
+    def add_intervals(self, intervals, team=None, sprint=None):
+        """Adds (status, seconds) intervals, e.g. analyze_changelog()["status_intervals"]."""
+        for status, seconds in intervals:
+            self.add(status, seconds, team, sprint)
+
+    def scope(self, team=None, sprint=None):
+        """View that records into and reports on a single team/sprint."""
+        return _EngineScope(self, team, sprint)
+
+    def merge(self, other):
+        for (status, team, sprint), sketch in other._sketches.items():
+            self._sketch(status, team, sprint).merge(sketch)
+        return self
+
+    def sketch(self, status, team=None, sprint=None):
+        merged = QuantileSketch(self.relative_accuracy)
+        for (key_status, key_team, key_sprint), sketch in self._sketches.items():
+            if key_status == status and _matches(key_team, team) and _matches(key_sprint, sprint):
+                merged.merge(sketch)
+        return merged
+
+    def report(self, team=None, sprint=None, percentiles=PERCENTILES):
+        """{status: {"count", "mean", "p50", "p85", "p95"}} in seconds for the matching sketches."""
+        statuses = sorted({
+            status for status, key_team, key_sprint in self._sketches
+            if _matches(key_team, team) and _matches(key_sprint, sprint)
+        })
+        report = {}
+        for status in statuses:
+            sketch = self.sketch(status, team, sprint)
+            summary = {"count": sketch.count, "mean": round(sketch.mean(), 2)}
+            for p in percentiles:
+                summary[f"p{p}"] = round(sketch.quantile(p / 100), 2)
+            report[status] = summary
+        return report
+
+    def to_dict(self):
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "sketches": [[status, team, sprint, sketch.to_dict()] for (status, team, sprint), sketch in self._sketches.items()],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        engine = cls(data["relative_accuracy"])
+        for status, team, sprint, sketch in data["sketches"]:
+            engine._sketches[(status, team, sprint)] = QuantileSketch.from_dict(sketch)
+        return engine
+
+    def _sketch(self, status, team, sprint):
+        key = (status, team, sprint)
+        sketch = self._sketches.get(key)
+        if sketch is None:
+            sketch = self._sketches[key] = QuantileSketch(self.relative_accuracy)
+        return sketch
+
+
+class _EngineScope:
+    def __init__(self, engine, team, sprint):
+        self.engine = engine
+        self.team = team
+        self.sprint = sprint
+
+    def add_intervals(self, intervals):
+        self.engine.add_intervals(intervals, self.team, self.sprint)
+
+    def add_many(self, status, seconds):
+        self.engine.add_many(status, seconds, self.team, self.sprint)
+
+    def report(self, percentiles=PERCENTILES):
+        return self.engine.report(self.team, self.sprint, percentiles)
+
+
+def _matches(value, wanted):
+    return wanted is None or value == wanted